@@ -5,9 +5,10 @@
 Measures performance metrics for key operations
 """
 
+import argparse
+import gc
 import time
 import json
-import numpy as np
 from pathlib import Path
 import sys
 import os
@@ -15,9 +16,15 @@
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+# File benchmark sizes and a shared payload sliced per size
+FILE_TEST_SIZES_KB = [1, 10, 100]
+_PAYLOAD = b"x" * (max(FILE_TEST_SIZES_KB) * 1024)
+
 
 def benchmark_audio_processing():
     """Benchmark audio processing performance"""
+    import numpy as np
+    
     print("=" * 50)
     print("Audio Processing Benchmark")
     print("=" * 50)
@@ -54,6 +61,8 @@ def benchmark_audio_processing():
 
 def benchmark_chunk_processing():
     """Benchmark chunk processing for real-time transcription"""
+    import numpy as np
+    
     print("=" * 50)
     print("Chunk Processing Benchmark")
     print("=" * 50)
@@ -70,8 +79,8 @@ def benchmark_chunk_processing():
         for i in range(num_chunks):
             # Simulate chunk creation
             chunk = np.zeros(chunk_size * sample_rate, dtype=np.int16)
-            # Simulate processing delay
-            time.sleep(0.001)  # 1ms processing per chunk
+            # Real per-chunk work (vectorized abs + reduce); int32 output avoids overflow
+            _ = np.abs(chunk, dtype=np.int32).sum()
         
         total_time = time.time() - start
         avg_chunk_time = (total_time / num_chunks) * 1000
@@ -99,22 +108,40 @@ def benchmark_json_operations():
         }
     }
     
+    # Build the decode input once, outside both timed regions
+    json_str = json.dumps(test_data)
+    
     # Encoding benchmark
-    start = time.time()
+    start = time.perf_counter()
+    for _ in range(1000):
+        json.dumps(test_data)
+    encode_time = (time.perf_counter() - start) / 1000 * 1000  # ms per operation
+    
+    # Template encoding benchmark: the metadata block never changes, so encode it
+    # once and splice it in, re-encoding only the varying text fields
+    metadata_json = json.dumps(test_data['metadata']).encode()
+    start = time.perf_counter()
     for _ in range(1000):
-        json_str = json.dumps(test_data)
-    encode_time = (time.time() - start) / 1000 * 1000  # ms per operation
+        template_bytes = (b'{"transcription": ' + json.dumps(test_data['transcription']).encode()
+                          + b', "formatted": ' + json.dumps(test_data['formatted']).encode()
+                          + b', "metadata": ' + metadata_json + b'}')
+    template_time = (time.perf_counter() - start) / 1000 * 1000  # ms per operation
+    assert template_bytes == json_str.encode()
+    
+    # Keep garbage from the encode loop out of the decode timing
+    gc.collect()
     
     # Decoding benchmark
-    start = time.time()
+    start = time.perf_counter()
     for _ in range(1000):
-        decoded = json.loads(json_str)
-    decode_time = (time.time() - start) / 1000 * 1000  # ms per operation
+        json.loads(json_str)
+    decode_time = (time.perf_counter() - start) / 1000 * 1000  # ms per operation
     
     data_size_kb = len(json_str) / 1024
     
     print(f"  Data Size: {data_size_kb:.2f}KB")
     print(f"  Encode: {encode_time:.3f}ms per operation")
+    print(f"  Encode (cached metadata): {template_time:.3f}ms per operation")
     print(f"  Decode: {decode_time:.3f}ms per operation")
     print(f"  Total: {encode_time + decode_time:.3f}ms round-trip")
     
@@ -128,19 +155,18 @@ def benchmark_file_operations():
     print("=" * 50)
     
     test_file = Path("benchmark_test.tmp")
-    test_sizes = [1, 10, 100]  # KB
     
-    for size_kb in test_sizes:
-        data = "x" * (size_kb * 1024)
+    for size_kb in FILE_TEST_SIZES_KB:
+        data = _PAYLOAD[:size_kb * 1024]
         
         # Write benchmark
         start = time.time()
-        test_file.write_text(data)
+        test_file.write_bytes(data)
         write_time = (time.time() - start) * 1000
         
         # Read benchmark
         start = time.time()
-        read_data = test_file.read_text()
+        test_file.read_bytes()
         read_time = (time.time() - start) * 1000
         
         print(f"  Size: {size_kb:3d}KB | Write: {write_time:6.2f}ms | "
@@ -187,19 +213,34 @@ def calculate_throughput_metrics():
     print("\n[OK] Throughput metrics calculated\n")
 
 
+BENCHMARKS = {
+    'audio': benchmark_audio_processing,
+    'chunk': benchmark_chunk_processing,
+    'json': benchmark_json_operations,
+    'file': benchmark_file_operations,
+    'throughput': calculate_throughput_metrics,
+}
+
+
 def main():
     """Run all benchmarks"""
+    parser = argparse.ArgumentParser(description="OpenSuperWhisper Performance Benchmark")
+    parser.add_argument('--only', choices=BENCHMARKS.keys(),
+                        help="Run a single benchmark (numpy is only imported by audio/chunk)")
+    args = parser.parse_args()
+    
+    if args.only:
+        BENCHMARKS[args.only]()
+        return
+    
     print("\n" + "=" * 50)
     print("OpenSuperWhisper Performance Benchmark")
     print("Version: 0.7.0")
     print("=" * 50 + "\n")
     
     # Run benchmarks
-    benchmark_audio_processing()
-    benchmark_chunk_processing()
-    benchmark_json_operations()
-    benchmark_file_operations()
-    calculate_throughput_metrics()
+    for benchmark in BENCHMARKS.values():
+        benchmark()
     
     print("=" * 50)
     print("Benchmark Summary")
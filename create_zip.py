@@ -1,20 +1,208 @@
+import argparse
+import mmap
+import stat
+import tarfile
+import time
 import zipfile
+import zlib
 import os
-import sys
-
-def create_zip(source_dir, output_file):
-    """Create a zip archive from a directory"""
-    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(source_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, os.path.dirname(source_dir))
-                zipf.write(file_path, arcname)
-                print(f"Added {arcname}")
-    print(f"Created {output_file}")
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+try:
+    import deflate  # libdeflate binding: faster than zlib at the same ratio
+except ImportError:
+    deflate = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESS_LEVEL = 6
+OUTPUT_BUFFER_SIZE = 1 << 20
+MMAP_THRESHOLD = 64 * 1024  # below this, mmap setup costs more than a plain read
+ZIP_EPOCH = 315532800  # 1980-01-01T00:00:00Z, the earliest date a ZIP entry can hold
+ZSTD_LEVEL = 19
+
+# Already-compressed or packed payloads: DEFLATE only burns CPU and can grow them
+STORED_EXTS = frozenset({
+    '.png', '.jpg', '.jpeg', '.ico', '.mp3', '.mp4', '.wav', '.ogg',
+    '.zip', '.gz', '.zst', '.woff2', '.pyd', '.so',
+})
+
+
+def _source_date_epoch():
+    """Fixed archive timestamp: SOURCE_DATE_EPOCH if set, else the ZIP epoch (1980-01-01)
+
+    An empty or blank SOURCE_DATE_EPOCH (as CI templates often export) counts as unset.
+    """
+    return max(int(os.getenv("SOURCE_DATE_EPOCH", "").strip() or 0), ZIP_EPOCH)
+
+
+def _normalize_zinfo(zinfo, date_time):
+    """Make an entry independent of build time, umask and host OS"""
+    zinfo.date_time = date_time
+    mode = 0o755 if (zinfo.external_attr >> 16) & 0o111 else 0o644
+    zinfo.external_attr = (stat.S_IFREG | mode) << 16
+    zinfo.create_system = 3  # Unix, so the permission bits above are honoured
+
+
+def _normalize_tarinfo(tarinfo, mtime):
+    """tarfile filter with the same normalization as _normalize_zinfo"""
+    tarinfo.mtime = mtime
+    tarinfo.uid = tarinfo.gid = 0
+    tarinfo.uname = tarinfo.gname = ""
+    tarinfo.mode = 0o755 if tarinfo.isdir() or tarinfo.mode & 0o111 else 0o644
+    return tarinfo
+
+
+def compress_raw(data, level=COMPRESS_LEVEL):
+    """Compress data to a raw DEFLATE stream, returning (compressed, crc32)
+
+    libdeflate accepts levels up to 12; zlib is capped at 9.
+    """
+    if deflate is not None:
+        return deflate.deflate_compress(data, level), deflate.crc32(data)
+    compressor = zlib.compressobj(min(level, 9), zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(), zlib.crc32(data)
+
+
+class PrecompressedZipFile(zipfile.ZipFile):
+    """ZipFile that accepts entry data which has already been compressed"""
+
+    def write_compressed(self, zinfo, data, file_size, crc):
+        """Append an entry whose data is already encoded with zinfo.compress_type"""
+        if self._writing:
+            raise ValueError("Can't write to the ZIP file while there is another write handle open on it.")
+
+        zinfo.file_size = file_size
+        zinfo.compress_size = len(data)
+        zinfo.CRC = crc
+        zinfo.flag_bits = 0x00
+        if not zinfo.external_attr:
+            zinfo.external_attr = 0o600 << 16
+
+        zip64 = max(file_size, len(data)) > zipfile.ZIP64_LIMIT
+        if zip64 and not self._allowZip64:
+            raise zipfile.LargeZipFile("Filesize would require ZIP64 extensions")
+
+        with self._lock:
+            if self._seekable:
+                self.fp.seek(self.start_dir)
+            zinfo.header_offset = self.fp.tell()
+            self._writecheck(zinfo)
+            self._didModify = True
+            self.fp.write(zinfo.FileHeader(zip64))
+            self.fp.write(data)
+            self.start_dir = self.fp.tell()
+            self.filelist.append(zinfo)
+            self.NameToInfo[zinfo.filename] = zinfo
+
+
+def _encode_entry(entry, date_time, level=COMPRESS_LEVEL):
+    """Read and encode one archive entry (runs in a worker process)
+
+    Large files are mapped instead of read, so CRC and compression work
+    straight off the page cache. Large stored entries return no data: the
+    writer copies them from their own mapping instead of receiving the bytes
+    back through the process pool.
+    """
+    file_path, arcname = entry
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    _normalize_zinfo(zinfo, date_time)
+    stored = os.path.splitext(file_path)[1].lower() in STORED_EXTS
+    zinfo.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+    with open(file_path, 'rb') as f:
+        if zinfo.file_size < MMAP_THRESHOLD:
+            data = f.read()
+            if stored:
+                return zinfo, data, len(data), zlib.crc32(data)
+            compressed, crc = compress_raw(data, level)
+            return zinfo, compressed, len(data), crc
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if stored:
+                return zinfo, None, len(mm), zlib.crc32(mm)
+            compressed, crc = compress_raw(mm, level)
+            return zinfo, compressed, len(mm), crc
+
+
+def _iter_files(directory):
+    """Yield file paths below directory (symlinked directories are not followed, like os.walk)"""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path)
+            elif entry.is_file():
+                yield entry.path
+
+
+def create_zip(source_dir, output_file, level=COMPRESS_LEVEL):
+    """Create a zip archive from a directory
+
+    Entries are compressed in parallel worker processes and written to the
+    archive serially in arcname order, with fixed timestamps and permissions
+    so the archive is reproducible.
+    """
+    # Every path below source_dir starts with its parent, so arcnames are a plain slice
+    base_len = len(os.path.join(os.path.dirname(source_dir), ''))
+    # Sorted so identical trees always produce byte-identical archives
+    entries = sorted(
+        ((file_path, file_path[base_len:]) for file_path in _iter_files(source_dir)), key=lambda e: e[1]
+    )
+
+    date_time = time.gmtime(_source_date_epoch())[:6]  # Shared by every entry
+    verbose = bool(os.getenv("VERBOSE"))
+    count = 0
+    total_bytes = 0
+
+    # A 1 MB write buffer coalesces the many small header/entry writes into few syscalls
+    with ProcessPoolExecutor() as executor, open(output_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) as raw, \
+            PrecompressedZipFile(raw, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zipf:
+        results = executor.map(partial(_encode_entry, date_time=date_time, level=level), entries, chunksize=16)
+        for (file_path, _), (zinfo, data, file_size, crc) in zip(entries, results, strict=True):
+            if data is None:
+                with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    zipf.write_compressed(zinfo, mm, file_size, crc)
+            else:
+                zipf.write_compressed(zinfo, data, file_size, crc)
+            count += 1
+            total_bytes += file_size
+            if verbose:
+                print(f"Added {zinfo.filename}")
+            elif count % 500 == 0:
+                print(f"... {count} files")
+    print(f"Added {count} files ({total_bytes / 1e6:.1f} MB) to {output_file} "
+          f"({os.path.getsize(output_file) / 1e6:.1f} MB)")
     return output_file
 
+
+def create_tar_zst(source_dir, output_file, level=ZSTD_LEVEL):
+    """Create a multi-threaded Zstandard-compressed tarball from a directory"""
+    if zstandard is None:
+        raise RuntimeError("tar.zst output requires the 'zstandard' package")
+
+    cctx = zstandard.ZstdCompressor(level=level, threads=-1)
+    with open(output_file, 'wb') as f, cctx.stream_writer(f) as z, tarfile.open(fileobj=z, mode='w|') as tar:
+        tar.add(source_dir, arcname=os.path.basename(os.path.normpath(source_dir)),
+                filter=partial(_normalize_tarinfo, mtime=_source_date_epoch()))
+    print(f"Created {output_file} ({os.path.getsize(output_file) / 1e6:.1f} MB)")
+    return output_file
+
+
 if __name__ == "__main__":
-    source = sys.argv[1] if len(sys.argv) > 1 else "dist/windows/amd64/opensuperwhisper-v0.7.0-windows-amd64"
-    output = sys.argv[2] if len(sys.argv) > 2 else "dist/windows/amd64/opensuperwhisper-v0.7.0-windows-amd64.zip"
-    create_zip(source, output)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Package a build directory for distribution")
+    parser.add_argument("source", nargs="?", default="dist/windows/amd64/opensuperwhisper-v0.7.0-windows-amd64")
+    parser.add_argument("output", nargs="?", default="dist/windows/amd64/opensuperwhisper-v0.7.0-windows-amd64.zip")
+    parser.add_argument("--format", choices=["zip", "tar.zst", "both"], default="both" if zstandard else "zip",
+                        help="zip for compatibility, tar.zst for smaller/faster downloads")
+    parser.add_argument("--level", type=int, default=COMPRESS_LEVEL,
+                        help="DEFLATE level for zip (up to 12 with libdeflate, for one-off release builds)")
+    args = parser.parse_args()
+
+    if args.format in ("zip", "both"):
+        create_zip(args.source, args.output, args.level)
+    if args.format in ("tar.zst", "both"):
+        base = args.output[:-4] if args.output.endswith(".zip") else args.output
+        create_tar_zst(args.source, base + ".tar.zst")
@@ -207,6 +207,20 @@ case "$OS_TARGET" in
         ;;
 esac
 
+# Zstandard sidecar: smaller download and much faster extraction than DEFLATE/gzip
+if command -v zstd &> /dev/null; then
+    tar -I "zstd -19 -T0" -cf "${ARCHIVE_NAME}.tar.zst" "${APP_NAME}-${VERSION}-${OS_TARGET}-${ARCH_TARGET}"
+    echo -e "${GREEN}✓${NC} Created: ${ARCHIVE_NAME}.tar.zst"
+fi
+
+# Report download size against the unpacked onedir tree
+echo "  Unpacked: $(du -sb "${APP_NAME}-${VERSION}-${OS_TARGET}-${ARCH_TARGET}" | cut -f1) bytes"
+for archive in "${ARCHIVE_NAME}".zip "${ARCHIVE_NAME}".tar.gz "${ARCHIVE_NAME}".tar.zst; do
+    if [ -f "$archive" ]; then
+        echo "  ${archive}: $(du -sb "$archive" | cut -f1) bytes"
+    fi
+done
+
 # Generate checksums
 echo ""
 echo -e "${YELLOW}Generating checksums...${NC}"
@@ -218,9 +232,13 @@ elif [ -f "${ARCHIVE_NAME}.tar.gz" ]; then
     sha256sum "${ARCHIVE_NAME}.tar.gz" > "${ARCHIVE_NAME}.tar.gz.sha256"
     echo -e "${GREEN}✓${NC} Created: ${ARCHIVE_NAME}.tar.gz.sha256"
 fi
+if [ -f "${ARCHIVE_NAME}.tar.zst" ]; then
+    sha256sum "${ARCHIVE_NAME}.tar.zst" > "${ARCHIVE_NAME}.tar.zst.sha256"
+    echo -e "${GREEN}✓${NC} Created: ${ARCHIVE_NAME}.tar.zst.sha256"
+fi
 
 # Create SHA256SUMS file for all archives in this directory
-sha256sum *.{zip,tar.gz} 2>/dev/null > SHA256SUMS || true
+sha256sum *.{zip,tar.gz,tar.zst} 2>/dev/null > SHA256SUMS || true
 
 cd - > /dev/null
 
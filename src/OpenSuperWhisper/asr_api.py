@@ -1,31 +1,45 @@
 import os
+import threading
+from typing import IO, Any
 
 from openai import OpenAI
 
 client = None
+_client_lock = threading.Lock()
 
 
 def get_client() -> OpenAI:
     global client
     if client is None:
-        # Set shorter timeouts for CI environments
-        timeout = 60.0 if os.getenv("CI") else 120.0
-        client = OpenAI(timeout=timeout)
+        # Chunks are transcribed from several worker threads; create a single client so
+        # they all share its keep-alive connection pool instead of each opening its own
+        with _client_lock:
+            if client is None:
+                # Set shorter timeouts for CI environments
+                timeout = 60.0 if os.getenv("CI") else 120.0
+                client = OpenAI(timeout=timeout)
     return client
 
 
-def transcribe_audio(audio_path: str, model: str = "whisper-1") -> str:
+def transcribe_audio(audio: str | tuple[str, bytes | IO[bytes]], model: str = "whisper-1") -> str:
     """
-    Transcribe the given audio file using OpenAI's ASR API.
-    :param audio_path: Path to an audio file (wav, mp3, etc.)
+    Transcribe the given audio using OpenAI's ASR API.
+    :param audio: Path to an audio file (wav, mp3, etc.), or a (filename, data or binary file) tuple.
+        The filename's extension tells the API the audio format.
     :param model: ASR model to use (e.g., 'whisper-1', 'gpt-4o-transcribe', 'gpt-4o-mini-transcribe')
     :return: Transcribed text as a string.
     :raises: Exception if transcription fails.
     """
-    with open(audio_path, "rb") as audio_file:
-        try:
-            client = get_client()
-            transcript = client.audio.transcriptions.create(file=audio_file, model=model, response_format="text")
-        except Exception as e:
-            raise Exception(f"ASR transcription failed: {e}") from e
+    if isinstance(audio, str):
+        with open(audio, "rb") as audio_file:
+            return _transcribe(audio_file, model)
+    return _transcribe(audio, model)
+
+
+def _transcribe(file: Any, model: str) -> str:
+    try:
+        client = get_client()
+        transcript = client.audio.transcriptions.create(file=file, model=model, response_format="text")
+    except Exception as e:
+        raise Exception(f"ASR transcription failed: {e}") from e
     return transcript.strip()
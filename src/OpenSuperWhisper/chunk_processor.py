@@ -3,18 +3,35 @@
 Manages parallel processing of audio chunks for real-time transcription
 """
 
-import gc
+import queue
+import struct
+import threading
 import time
 from collections.abc import Callable
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
+from functools import partial
 from typing import Any
 
 import numpy as np
 
 from . import asr_api, formatter_api, logger
 
+SAMPLE_RATE = 16000
+MAX_OVERLAP = 50  # Longest chunk-boundary overlap remove_duplicate_text looks for
+
+# 44-byte RIFF/WAVE header; only the RIFF and data chunk sizes vary per chunk
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+WAV_HEADER_SIZE = _WAV_HEADER.size
+
+
+def wav_header(data_size: int, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Pack the header of a mono 16-bit PCM WAV file whose sample data is data_size bytes"""
+    # fmt chunk: PCM, mono, sample rate, byte rate, block align, 16 bits per sample
+    fmt = (1, 1, sample_rate, sample_rate * 2, 2, 16)
+    return _WAV_HEADER.pack(b"RIFF", 36 + data_size, b"WAVE", b"fmt ", 16, *fmt, b"data", data_size)
+
 
 class ChunkStatus(Enum):
     """Status of chunk processing"""
@@ -39,6 +56,44 @@ class ChunkResult:
     timestamp: float = 0.0
 
 
+class _MergedText:
+    """
+    Chunk texts merged with ChunkProcessor.remove_duplicate_text semantics
+
+    Keeps each line as a list of pieces plus its length and last characters,
+    rather than rebuilding the ever-growing line string for every chunk.
+    """
+
+    def __init__(self, processor: "ChunkProcessor"):
+        self.processor = processor
+        self.lines: list[list[str]] = []
+        self.line_length = 0
+        self.tail = ""
+
+    def new_line(self, text: str) -> None:
+        """Start a new line with text"""
+        self.lines.append([])
+        self.line_length = 0
+        self.tail = ""
+        self._append(text)
+
+    def merge(self, text: str) -> None:
+        """Append text to the current line, dropping what duplicates its end"""
+        if not self.lines:
+            self.new_line(text)
+            return
+        self._append(text[self.processor._overlap_length(self.tail, self.line_length, text) :])
+
+    def _append(self, piece: str) -> None:
+        self.lines[-1].append(piece)
+        self.line_length += len(piece)
+        self.tail = (self.tail + piece)[-MAX_OVERLAP:]
+
+    def join(self) -> str:
+        """Combined text, one line per run of merged chunks"""
+        return "\n".join("".join(pieces) for pieces in self.lines)
+
+
 class ChunkProcessor:
     """Manages parallel processing of audio chunks"""
 
@@ -63,7 +118,10 @@ def __init__(
             format_prompt: Formatting prompt
             style_guide: Style guide for formatting
         """
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Separate pools for the two API stages, so a chunk being formatted
+        # doesn't hold up the next chunk's transcription
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ChunkASR")
+        self.format_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ChunkFormat")
         self.asr_model = asr_model
         self.chat_model = chat_model
         self.format_enabled = format_enabled
@@ -72,17 +130,23 @@ def __init__(
         self.retry_manager = retry_manager
 
         # Track processing state
-        self.api_futures: list[Future] = []
+        self.api_futures: set[Future] = set()  # In-flight only; completed futures are discarded
         self.chunk_results: dict[int, ChunkResult] = {}
         self.processing_chunks: dict[int, np.ndarray] = {}
         self.cancel_flag = False
 
         # Memory management
         self.chunks_deleted = 0
+        self._scratch = threading.local()  # Per-worker PCM conversion buffers
+
+        # Completed futures are handed to one completion thread, started on first submit
+        self._completions: queue.SimpleQueue[tuple[int, Future] | None] = queue.SimpleQueue()
+        self._completion_thread: threading.Thread | None = None
 
         # Callbacks
         self.on_chunk_completed: Callable | None = None
         self.on_chunk_error: Callable | None = None
+        self.on_retry_scheduled: Callable | None = None  # (chunk_id, retry_time)
 
         logger.logger.info(f"ChunkProcessor initialized with {max_workers} workers")
 
@@ -101,35 +165,50 @@ def process_chunk(self, chunk_id: int, audio_data: np.ndarray) -> Future | None:
             logger.logger.warning(f"Processing cancelled, skipping chunk {chunk_id}")
             return None
 
-        # Store audio data
+        # Store audio data as one contiguous float32 buffer. Stream chunks already are, so
+        # this is a no-op for them; the same buffer then feeds the WAV encoder and retries.
+        audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
         self.processing_chunks[chunk_id] = audio_data
 
         # Initialize result
         self.chunk_results[chunk_id] = ChunkResult(chunk_id=chunk_id, status=ChunkStatus.PENDING, timestamp=time.time())
 
         # Submit for processing
-        future = self.executor.submit(self._process_chunk_task, chunk_id, audio_data)
+        if self._completion_thread is None:
+            self._completion_thread = threading.Thread(
+                target=self._drain_completions, name="ChunkCompletion", daemon=True
+            )
+            self._completion_thread.start()
+        future: Future = Future()
 
         # Track future
-        self.api_futures.append(future)
+        self.api_futures.add(future)
 
         # Set completion callback
-        future.add_done_callback(lambda f: self._handle_chunk_completion(chunk_id, f))
+        future.add_done_callback(partial(self._queue_completion, chunk_id))
+
+        self.executor.submit(self._process_chunk_task, chunk_id, audio_data, future)
 
         logger.logger.info(f"Submitted chunk {chunk_id} for processing")
         return future
 
-    def _process_chunk_task(self, chunk_id: int, audio_data: np.ndarray) -> ChunkResult:
+    def _process_chunk_task(self, chunk_id: int, audio_data: np.ndarray, future: Future) -> None:
         """
-        Process a single chunk (runs in thread pool)
+        Transcribe a single chunk (runs in the ASR thread pool)
+
+        Formatting is handed to the format pool, so this worker is free for the
+        next chunk's ASR while the chat model runs. Whichever stage finishes the
+        chunk sets future's result.
 
         Args:
             chunk_id: Chunk identifier
             audio_data: Audio data to process
-
-        Returns:
-            ChunkResult with processing outcome
+            future: Future for the whole chunk, resolved with its ChunkResult
         """
+        # Like the executor's own work items: a future cancelled while queued is skipped
+        if not future.set_running_or_notify_cancel():
+            return
+
         result = self.chunk_results[chunk_id]
         result.status = ChunkStatus.PROCESSING
 
@@ -137,71 +216,124 @@ def _process_chunk_task(self, chunk_id: int, audio_data: np.ndarray) -> ChunkRes
             # Check cancellation
             if self.cancel_flag:
                 result.status = ChunkStatus.CANCELLED
-                return result
+                future.set_result(result)
+                return
 
             # Step 1: ASR transcription
             logger.logger.info(f"Starting ASR for chunk {chunk_id}")
 
-            # Save audio to temporary file for API
-            import tempfile
-            import wave
-
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-                tmp_filename = tmp_file.name
-                # Write WAV file
-                with wave.open(tmp_file.name, "wb") as wav_file:
-                    wav_file.setnchannels(1)  # Mono
-                    wav_file.setsampwidth(2)  # 16-bit
-                    wav_file.setframerate(16000)  # 16kHz
-                    # Convert float32 to int16
-                    audio_int16 = (audio_data * 32767).astype(np.int16)
-                    wav_file.writeframes(audio_int16.tobytes())
-
-            try:
-                # Transcribe
-                raw_text = asr_api.transcribe_audio(tmp_filename, model=self.asr_model)
-                result.raw_text = raw_text
-            finally:
-                # Clean up - with retry logic for Windows file locking
-                import os
-                import time
-
-                for i in range(5):
-                    try:
-                        if os.path.exists(tmp_filename):
-                            os.unlink(tmp_filename)
-                        break
-                    except Exception as e:
-                        if i < 4:
-                            time.sleep(0.5)  # Wait before retry
-                        else:
-                            logger.logger.warning(f"Could not delete temp file {tmp_filename}: {e}")
+            # Encode WAV in memory and hand the bytes straight to the API
+            raw_text = asr_api.transcribe_audio(("chunk.wav", self._encode_wav(audio_data)), model=self.asr_model)
+            result.raw_text = raw_text
+
+            # Step 2: Format text (if enabled) in the format pool
+            if self.format_enabled and raw_text and not self.cancel_flag:
+                self.format_executor.submit(self._format_chunk_task, result, future)
+                return
 
             # Check cancellation again
             if self.cancel_flag:
                 result.status = ChunkStatus.CANCELLED
-                return result
+            else:
+                result.status = ChunkStatus.COMPLETED
+                logger.logger.info(f"Chunk {chunk_id} completed successfully")
+
+        except Exception as e:
+            logger.logger.error(f"Error processing chunk {chunk_id}: {e}")
+            result.status = ChunkStatus.ERROR
+            result.error = str(e)
+
+        future.set_result(result)
+
+    def _format_chunk_task(self, result: ChunkResult, future: Future) -> None:
+        """
+        Format a transcribed chunk (runs in the format thread pool)
 
-            # Step 2: Format text (if enabled)
-            if self.format_enabled and raw_text:
+        Args:
+            result: Chunk result holding the raw transcription
+            future: Future for the whole chunk, resolved with result
+        """
+        chunk_id = result.chunk_id
+        try:
+            # Check cancellation
+            if self.cancel_flag:
+                result.status = ChunkStatus.CANCELLED
+            else:
                 logger.logger.info(f"Starting formatting for chunk {chunk_id}")
-                formatted_text = formatter_api.format_text(
-                    raw_text,
+                result.formatted_text = formatter_api.format_text(
+                    result.raw_text or "",
                     self.format_prompt,
                     self.style_guide,
                     model=self.chat_model,
                 )
-                result.formatted_text = formatted_text
-
-            result.status = ChunkStatus.COMPLETED
-            logger.logger.info(f"Chunk {chunk_id} completed successfully")
+                result.status = ChunkStatus.COMPLETED
+                logger.logger.info(f"Chunk {chunk_id} completed successfully")
 
         except Exception as e:
             logger.logger.error(f"Error processing chunk {chunk_id}: {e}")
             result.status = ChunkStatus.ERROR
             result.error = str(e)
 
-        return result
+        future.set_result(result)
+
+    def _to_int16(self, audio_data: np.ndarray) -> np.ndarray:
+        """
+        Convert float samples to 16-bit PCM without per-chunk temporaries
+
+        Clips to [-1.0, 1.0] and scales straight into int16, reusing scratch
+        buffers owned by the calling worker thread. The returned array is a
+        view into that scratch and is only valid until the thread's next call.
+
+        Args:
+            audio_data: Float audio samples
+
+        Returns:
+            int16 view of the converted samples
+        """
+        n = len(audio_data)
+        scratch = self._scratch
+        if getattr(scratch, "size", -1) < n:  # -1 so even an empty first call allocates
+            scratch.float32 = np.empty(n, dtype=np.float32)
+            scratch.int16 = np.empty(n, dtype=np.int16)
+            scratch.size = n
+
+        clipped = np.clip(audio_data, -1.0, 1.0, out=scratch.float32[:n])
+        return np.multiply(clipped, np.float32(32767.0), out=scratch.int16[:n], casting="unsafe")
+
+    def _encode_wav(self, audio_data: np.ndarray) -> bytes:
+        """
+        Encode float audio as a 16 kHz mono 16-bit WAV file image
+
+        The format is fixed, so the header is packed directly rather than
+        going through the wave module.
+
+        Args:
+            audio_data: Float audio samples
+
+        Returns:
+            Complete WAV file contents
+        """
+        pcm = self._to_int16(audio_data).astype("<i2", copy=False)
+        return b"".join((wav_header(pcm.nbytes), pcm))
+
+    def _queue_completion(self, chunk_id: int, future: Future) -> None:
+        """
+        Done-callback: hand a finished future to the completion thread
+
+        Runs on the pool worker that finished the chunk, so it only enqueues and
+        the worker can go straight back to the next API call.
+
+        Args:
+            chunk_id: Chunk identifier
+            future: Completed future
+        """
+        self.api_futures.discard(future)
+        self._completions.put((chunk_id, future))
+
+    def _drain_completions(self) -> None:
+        """Completion thread: handle finished chunks in completion order until shutdown"""
+        while (item := self._completions.get()) is not None:
+            self._handle_chunk_completion(*item)
 
     def _handle_chunk_completion(self, chunk_id: int, future: Future) -> None:
         """
@@ -217,15 +349,12 @@ def _handle_chunk_completion(self, chunk_id: int, future: Future) -> None:
             # Update stored result
             self.chunk_results[chunk_id] = result
 
-            # Clean up audio data
-            if chunk_id in self.processing_chunks:
-                del self.processing_chunks[chunk_id]
+            # Clean up audio data. Nothing else references the array, so reference
+            # counting frees it here; a forced gc.collect() would only rescan every
+            # live object in the process.
+            if self.processing_chunks.pop(chunk_id, None) is not None:
                 self.chunks_deleted += 1
 
-                # Efficient garbage collection (every 10 chunks)
-                if self.chunks_deleted % 10 == 0:
-                    gc.collect()
-
             # Call appropriate callback
             if result.status == ChunkStatus.COMPLETED:
                 if self.on_chunk_completed:
@@ -239,6 +368,8 @@ def _handle_chunk_completion(self, chunk_id: int, future: Future) -> None:
                     retry_time = self.retry_manager.schedule_retry(chunk_id, result.error)
                     if retry_time:
                         logger.logger.info(f"Scheduled retry for chunk {chunk_id}")
+                        if self.on_retry_scheduled:
+                            self.on_retry_scheduled(chunk_id, retry_time)
 
         except Exception as e:
             logger.logger.error(f"Error handling chunk {chunk_id} completion: {e}")
@@ -281,10 +412,9 @@ def cancel_all_processing(self) -> None:
         """Cancel all ongoing and pending processing"""
         self.cancel_flag = True
 
-        # Cancel pending futures
-        for future in self.api_futures:
-            if not future.done():
-                future.cancel()
+        # Cancel pending futures (copied: worker threads discard them as they finish)
+        for future in list(self.api_futures):
+            future.cancel()
 
         # Clear queues
         self.processing_chunks.clear()
@@ -311,19 +441,38 @@ def remove_duplicate_text(self, text1: str, text2: str) -> str:
         Returns:
             Combined text with duplicates removed
         """
-        if not text1 or not text2:
-            return text1 + text2
+        return text1 + text2[self._overlap_length(text1[-MAX_OVERLAP:], len(text1), text2) :]
 
-        # Dynamic window size (10% of text, max 50 chars)
-        window_size = min(len(text1) // 10, len(text2) // 10, 50)
+    def _overlap_length(self, tail: str, text1_len: int, text2: str) -> int:
+        """
+        Length of the duplicated text at the start of text2
+
+        Args:
+            tail: Last MAX_OVERLAP characters (or all, if shorter) of the previous text
+            text1_len: Full length of the previous text
+            text2: Beginning of current chunk
 
-        # Look for overlap
-        for i in range(window_size, 5, -1):
-            if text1[-i:] == text2[:i]:
-                return text1 + text2[i:]
+        Returns:
+            Number of leading characters of text2 that repeat the end of the previous text
+        """
+        if not tail or not text2:
+            return 0
+
+        # Dynamic window size (10% of text, max 50 chars)
+        window_size = min(text1_len // 10, len(text2) // 10, MAX_OVERLAP)
+
+        # Look for the longest overlap (at least 6 chars). An overlap of length
+        # window_size - pos can only start where the tail matches text2's first
+        # character, so jump between those positions instead of comparing every length.
+        tail = tail[-window_size:] if window_size > 0 else ""
+        pos = tail.find(text2[0])
+        while pos != -1 and window_size - pos > 5:
+            if text2.startswith(tail[pos:]):
+                return window_size - pos
+            pos = tail.find(text2[0], pos + 1)
 
         # No overlap found
-        return text1 + text2
+        return 0
 
     def combine_results(self, results: list[ChunkResult] | None = None) -> tuple[str, str]:
         """
@@ -338,37 +487,25 @@ def combine_results(self, results: list[ChunkResult] | None = None) -> tuple[str
         if results is None:
             results = self.get_results_in_order()
 
-        raw_texts: list[str] = []
-        formatted_texts: list[str] = []
+        raw_text = _MergedText(self)
+        formatted_text = _MergedText(self)
 
-        for i, result in enumerate(results):
+        for result in results:
             if result.status == ChunkStatus.COMPLETED:
-                # Handle raw text
+                # Merge into the previous chunk's text, removing duplicates at the boundary
                 if result.raw_text:
-                    if i > 0 and raw_texts:
-                        # Remove duplicates with previous chunk
-                        combined = self.remove_duplicate_text(raw_texts[-1], result.raw_text)
-                        raw_texts[-1] = combined
-                    else:
-                        raw_texts.append(result.raw_text)
-
-                # Handle formatted text
+                    raw_text.merge(result.raw_text)
                 if result.formatted_text:
-                    if i > 0 and formatted_texts:
-                        # Remove duplicates with previous chunk
-                        combined = self.remove_duplicate_text(formatted_texts[-1], result.formatted_text)
-                        formatted_texts[-1] = combined
-                    else:
-                        formatted_texts.append(result.formatted_text)
+                    formatted_text.merge(result.formatted_text)
 
             elif result.status == ChunkStatus.ERROR:
                 # Add error placeholder
                 error_text = "[エラー: 取得失敗]"
-                raw_texts.append(error_text)
-                formatted_texts.append(error_text)
+                raw_text.new_line(error_text)
+                formatted_text.new_line(error_text)
 
-        raw_combined = "\n".join(raw_texts)
-        formatted_combined = "\n".join(formatted_texts)
+        raw_combined = raw_text.join()
+        formatted_combined = formatted_text.join()
 
         return (raw_combined, formatted_combined)
 
@@ -403,4 +540,10 @@ def shutdown(self) -> None:
         if self.retry_manager:
             self.retry_manager.cancel_all_retries()
         self.executor.shutdown(wait=True)
+        self.format_executor.shutdown(wait=True)  # After the ASR pool: its tasks submit here
+        if self._completion_thread is not None:
+            # Every done-callback has been queued by now; let the thread drain them and exit
+            self._completions.put(None)
+            self._completion_thread.join()
+            self._completion_thread = None
         logger.logger.info("ChunkProcessor shutdown complete")
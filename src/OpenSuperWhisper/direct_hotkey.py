@@ -1,6 +1,7 @@
 """
 Direct Keyboard Monitoring
-Simple and reliable hotkey detection using direct Windows API polling
+Simple and reliable hotkey detection using a Windows low-level keyboard hook,
+falling back to direct Windows API polling
 """
 
 import sys
@@ -13,12 +14,22 @@
 VK_SPACE = 0x20
 VK_LCONTROL = 0xA2
 VK_RCONTROL = 0xA3
+WH_KEYBOARD_LL = 13
+WM_KEYDOWN = 0x0100
+WM_KEYUP = 0x0101
+WM_SYSKEYDOWN = 0x0104
+WM_SYSKEYUP = 0x0105
 
 
 class DirectHotkeyMonitor(QObject):
     """
-    Direct keyboard monitoring using GetAsyncKeyState polling
+    Direct keyboard monitoring using a WH_KEYBOARD_LL hook
     More reliable than RegisterHotKey for some systems
+
+    The hook only runs when a key changes state, instead of waking every 50ms
+    to query three keys. Its callback is delivered by the message loop of the
+    thread that installed it, which is the Qt main thread. If the hook can't
+    be installed, GetAsyncKeyState polling is used instead.
     """
 
     hotkey_pressed = Signal(str)
@@ -33,11 +44,21 @@ def __init__(self) -> None:
         # Try to import Windows API
         self.api_available = False
         self.user32: Any | None = None
+        self._get_key_state: Any | None = None
+        self._hook: Any | None = None
+        self._hook_api: Any | None = None
+        self._hook_proc: Any | None = None  # Must stay referenced while the hook is installed
         if sys.platform == "win32":
             try:
                 import ctypes
 
                 self.user32 = ctypes.windll.user32
+                # Bind GetAsyncKeyState once with an explicit prototype, from a private
+                # handle so other users of ctypes.windll.user32 keep their defaults
+                get_key_state = ctypes.WinDLL("user32").GetAsyncKeyState  # type: ignore[attr-defined]
+                get_key_state.argtypes = (ctypes.c_int,)
+                get_key_state.restype = ctypes.c_short
+                self._get_key_state = get_key_state
                 self.api_available = True
                 pass  # Windows API available
             except Exception:
@@ -53,7 +74,9 @@ def start_monitoring(self) -> bool:
             return True
 
         self.is_monitoring = True
-        self.poll_timer.start(50)  # Check every 50ms
+        self.last_state = False
+        if not self._install_hook():
+            self.poll_timer.start(50)  # Hook unavailable: check every 50ms
         pass  # Started monitoring
         return True
 
@@ -64,26 +87,110 @@ def stop_monitoring(self) -> None:
 
         self.is_monitoring = False
         self.poll_timer.stop()
+        if self._hook and self._hook_api is not None:
+            self._hook_api.UnhookWindowsHookEx(self._hook)
+            self._hook = None
+            self._hook_proc = None
         pass  # Stopped monitoring
 
+    def _install_hook(self) -> bool:
+        """Install the low-level keyboard hook, returning False if it isn't available"""
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class KBDLLHOOKSTRUCT(ctypes.Structure):
+                _fields_ = [
+                    ("vkCode", wintypes.DWORD),
+                    ("scanCode", wintypes.DWORD),
+                    ("flags", wintypes.DWORD),
+                    ("time", wintypes.DWORD),
+                    ("dwExtraInfo", ctypes.c_size_t),
+                ]
+
+            # Private library handles, so declaring prototypes here doesn't change
+            # how other modules' calls through ctypes.windll.user32 are converted
+            user32 = ctypes.WinDLL("user32", use_last_error=True)  # type: ignore[attr-defined]
+            kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)  # type: ignore[attr-defined]
+            hookproc_type = ctypes.WINFUNCTYPE(  # type: ignore[attr-defined]
+                wintypes.LPARAM, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM
+            )
+            user32.SetWindowsHookExW.argtypes = (ctypes.c_int, hookproc_type, wintypes.HINSTANCE, wintypes.DWORD)
+            user32.SetWindowsHookExW.restype = wintypes.HHOOK
+            user32.CallNextHookEx.argtypes = (wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+            user32.CallNextHookEx.restype = wintypes.LPARAM
+            user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
+            user32.UnhookWindowsHookEx.restype = wintypes.BOOL
+            kernel32.GetModuleHandleW.argtypes = (wintypes.LPCWSTR,)
+            kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+            def hook_proc(n_code: int, w_param: int, l_param: int) -> int:
+                # Must return quickly: Windows silently removes slow low-level hooks
+                if n_code == 0:  # HC_ACTION
+                    try:
+                        event = ctypes.cast(l_param, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
+                        self._on_key_event(event.vkCode, w_param in (WM_KEYDOWN, WM_SYSKEYDOWN))
+                    except Exception:
+                        pass  # Never let an error swallow the key event
+                return user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+            self._hook_api = user32
+            self._hook_proc = hookproc_type(hook_proc)
+            self._hook = user32.SetWindowsHookExW(WH_KEYBOARD_LL, self._hook_proc, kernel32.GetModuleHandleW(None), 0)
+            if not self._hook:
+                self._hook_proc = None
+                return False
+            return True
+
+        except Exception:
+            self._hook = None
+            self._hook_proc = None
+            return False
+
+    def _key_down(self, vk_code: int) -> bool:
+        """Whether a key is down according to the async key state"""
+        return bool(self._get_key_state is not None and self._get_key_state(vk_code) & 0x8000)
+
+    def _on_key_event(self, vk_code: int, pressed: bool) -> None:
+        """Update hotkey state from a hooked key press or release"""
+        # The async key state doesn't reflect the event being hooked yet, so the
+        # key that changed comes from the event and only the other keys are queried
+        if vk_code == VK_SPACE:
+            space_pressed = pressed
+            ctrl_pressed = self._key_down(VK_CONTROL)
+        elif vk_code in (VK_LCONTROL, VK_RCONTROL, VK_CONTROL):
+            other_ctrl = VK_RCONTROL if vk_code == VK_LCONTROL else VK_LCONTROL
+            ctrl_pressed = pressed or self._key_down(other_ctrl)
+            space_pressed = self._key_down(VK_SPACE)
+        else:
+            return
+
+        current_state = ctrl_pressed and space_pressed
+
+        # Only trigger on new press (auto-repeat keeps sending key-down while held)
+        if current_state and not self.last_state:
+            pass  # Hotkey detected
+            self.hotkey_pressed.emit("ctrl_space")
+
+        self.last_state = current_state
+
     def check_keys(self) -> None:
         """Check for Ctrl+Space combination"""
-        if not self.api_available or self.user32 is None:
+        get_key_state = self._get_key_state
+        if not self.api_available or get_key_state is None:
             return
 
         try:
+            # Check Space first: it is rarely held, so most ticks stop after one call
+            space_pressed = get_key_state(VK_SPACE) & 0x8000
+
             # Check if Control is pressed (either left or right)
-            ctrl_pressed = (
-                (self.user32.GetAsyncKeyState(VK_CONTROL) & 0x8000)
-                or (self.user32.GetAsyncKeyState(VK_LCONTROL) & 0x8000)
-                or (self.user32.GetAsyncKeyState(VK_RCONTROL) & 0x8000)
+            current_state = bool(space_pressed) and bool(
+                (get_key_state(VK_CONTROL) & 0x8000)
+                or (get_key_state(VK_LCONTROL) & 0x8000)
+                or (get_key_state(VK_RCONTROL) & 0x8000)
             )
 
-            # Check if Space is pressed
-            space_pressed = self.user32.GetAsyncKeyState(VK_SPACE) & 0x8000
-
-            current_state = ctrl_pressed and space_pressed
-
             # Only trigger on new press (not held)
             if current_state and not self.last_state:
                 pass  # Hotkey detected
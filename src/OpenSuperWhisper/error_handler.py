@@ -2,8 +2,12 @@
 Comprehensive error handling for OpenSuperWhisper
 """
 
+import re
+import reprlib
 import sys
 import traceback
+from collections import Counter, deque
+from itertools import islice
 from typing import Optional, Dict, Any, Callable
 from datetime import datetime
 import logging
@@ -32,6 +36,39 @@ class ErrorCategory(Enum):
     UNKNOWN = "unknown"
 
 
+def _keywords(*keywords: str) -> re.Pattern[str]:
+    """Compile keywords into one case-insensitive alternation"""
+    return re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+# Bounded reprs for error context: the arguments can be large (e.g. audio arrays),
+# so stop formatting at the limits instead of building the full str and slicing it
+_context_repr = reprlib.Repr()
+_context_repr.maxstring = 80
+_context_repr.maxother = 80
+_context_repr.maxlist = _context_repr.maxtuple = _context_repr.maxdict = 4
+_context_repr.maxlevel = 2
+
+
+# Checked in order; the first category whose message (or exception type name)
+# contains one of its keywords wins
+_CLASSIFICATION_RULES = [
+    (
+        ErrorCategory.NETWORK,
+        _keywords('connection', 'network', 'timeout', 'refused', 'unreachable'),
+        _keywords('connection', 'timeout', 'urlerror'),
+    ),
+    (ErrorCategory.API, _keywords('api', 'unauthorized', 'forbidden', 'rate limit', 'quota'), None),
+    (ErrorCategory.AUDIO, _keywords('audio', 'microphone', 'recording', 'sample rate'), None),
+    (
+        ErrorCategory.FILE,
+        _keywords('file', 'path', 'directory', 'not found', 'access denied'),
+        _keywords('filenotfound', 'ioerror', 'oserror'),
+    ),
+    (ErrorCategory.PERMISSION, _keywords('permission', 'denied', 'unauthorized', 'admin'), None),
+]
+
+
 class OpenSuperWhisperError(Exception):
     """Base exception for OpenSuperWhisper"""
     
@@ -104,7 +141,10 @@ class ErrorHandler:
     
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.logger = logger or logging.getLogger(__name__)
-        self.error_history: list = []
+        self.error_history: deque = deque(maxlen=100)  # Keep last 100 errors
+        # Per-category/level counts of error_history, kept in step with it
+        self._by_category: Counter = Counter()
+        self._by_level: Counter = Counter()
         self.recovery_strategies: Dict[ErrorCategory, Callable] = {}
         self.error_callbacks: Dict[ErrorLevel, list] = {
             level: [] for level in ErrorLevel
@@ -156,9 +196,11 @@ def handle_error(
         self._log_error(error_info)
         
         # Store in history
+        if len(self.error_history) == self.error_history.maxlen:
+            self._forget(self.error_history[0])  # About to be evicted by append
         self.error_history.append(error_info)
-        if len(self.error_history) > 100:  # Keep last 100 errors
-            self.error_history.pop(0)
+        self._by_category[error_info['category']] += 1
+        self._by_level[error_info['level']] += 1
             
         # Execute callbacks
         self._execute_callbacks(level, error_info)
@@ -174,42 +216,12 @@ def handle_error(
         
     def _classify_error(self, error: Exception) -> ErrorCategory:
         """Classify an error into a category"""
-        error_str = str(error).lower()
-        error_type = type(error).__name__.lower()
+        error_str = str(error)
+        error_type = type(error).__name__
         
-        # Network errors
-        if any(keyword in error_str for keyword in [
-            'connection', 'network', 'timeout', 'refused', 'unreachable'
-        ]) or any(keyword in error_type for keyword in [
-            'connection', 'timeout', 'urlerror'
-        ]):
-            return ErrorCategory.NETWORK
-            
-        # API errors
-        if any(keyword in error_str for keyword in [
-            'api', 'unauthorized', 'forbidden', 'rate limit', 'quota'
-        ]):
-            return ErrorCategory.API
-            
-        # Audio errors
-        if any(keyword in error_str for keyword in [
-            'audio', 'microphone', 'recording', 'sample rate'
-        ]):
-            return ErrorCategory.AUDIO
-            
-        # File errors
-        if any(keyword in error_str for keyword in [
-            'file', 'path', 'directory', 'not found', 'access denied'
-        ]) or any(keyword in error_type for keyword in [
-            'filenotfound', 'ioerror', 'oserror'
-        ]):
-            return ErrorCategory.FILE
-            
-        # Permission errors
-        if any(keyword in error_str for keyword in [
-            'permission', 'denied', 'unauthorized', 'admin'
-        ]):
-            return ErrorCategory.PERMISSION
+        for category, message_pattern, type_pattern in _CLASSIFICATION_RULES:
+            if message_pattern.search(error_str) or (type_pattern and type_pattern.search(error_type)):
+                return category
             
         return ErrorCategory.UNKNOWN
         
@@ -270,24 +282,22 @@ def get_error_summary(self) -> Dict[str, Any]:
         """Get summary of recent errors"""
         if not self.error_history:
             return {'total': 0, 'by_category': {}, 'by_level': {}}
-            
+        
         summary = {
             'total': len(self.error_history),
-            'by_category': {},
-            'by_level': {},
-            'recent': self.error_history[-5:]  # Last 5 errors
+            'by_category': dict(self._by_category),
+            'by_level': dict(self._by_level),
+            'recent': list(islice(self.error_history, max(len(self.error_history) - 5, 0), None))  # Last 5 errors
         }
-        
-        for error in self.error_history:
-            category = error['category']
-            level = error['level']
-            
-            summary['by_category'][category] = \
-                summary['by_category'].get(category, 0) + 1
-            summary['by_level'][level] = \
-                summary['by_level'].get(level, 0) + 1
                 
         return summary
+        
+    def _forget(self, error_info: Dict[str, Any]):
+        """Remove an entry leaving error_history from the summary counters"""
+        for counter, key in ((self._by_category, error_info['category']), (self._by_level, error_info['level'])):
+            counter[key] -= 1
+            if not counter[key]:
+                del counter[key]
 
 
 def with_error_handling(
@@ -313,8 +323,8 @@ def wrapper(*args, **kwargs):
             except Exception as e:
                 context = {
                     'function': func.__name__,
-                    'args': str(args)[:100],  # Truncate for logging
-                    'kwargs': str(kwargs)[:100]
+                    'args': _context_repr.repr(args)[:100],  # Truncate for logging
+                    'kwargs': _context_repr.repr(kwargs)[:100]
                 }
                 
                 if isinstance(e, OpenSuperWhisperError):
@@ -2,16 +2,26 @@
 User feedback and analytics system for OpenSuperWhisper
 """
 
+import atexit
 import json
+import os
+import queue
 import sqlite3
+import time
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 import hashlib
 import platform
-from dataclasses import dataclass, asdict
+import threading
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+try:
+    import orjson  # Optional: C encoder/decoder, much faster than json for metadata/data
+except ImportError:
+    orjson = None
+
 
 class FeedbackType(Enum):
     """Types of user feedback"""
@@ -45,12 +55,8 @@ class UserFeedback:
     content: str
     rating: Optional[int] = None
     metadata: Optional[Dict[str, Any]] = None
-    timestamp: datetime = None
+    timestamp: float = field(default_factory=time.time)  # Unix epoch seconds
     user_id: Optional[str] = None
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
 
 
 @dataclass
@@ -58,17 +64,81 @@ class AnalyticsEvent:
     """Analytics event data structure"""
     event_type: EventType
     data: Optional[Dict[str, Any]] = None
-    timestamp: datetime = None
+    timestamp: float = field(default_factory=time.time)  # Unix epoch seconds
     session_id: Optional[str] = None
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+
+
+def _encode_json(value: Any) -> Any:
+    """Serialize metadata/data for storage (BLOB with orjson, TEXT otherwise)"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value)
+
+
+def _decode_json(stored: Any) -> Any:
+    """Deserialize a stored metadata/data value written by either codec"""
+    if orjson is not None:
+        return orjson.loads(stored)
+    return json.loads(stored)
+
+
+def _encode_export_entry(entry: Dict[str, Any]) -> bytes:
+    """Serialize one exported entry as indented JSON"""
+    if orjson is not None:
+        return orjson.dumps(entry, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    # ensure_ascii=False so the file matches orjson's raw UTF-8 output
+    return json.dumps(entry, indent=2, default=str, ensure_ascii=False).encode('utf-8')
+
+
+def _isoformat(timestamp: float) -> str:
+    """Format a stored epoch timestamp as local ISO 8601, as it is presented to users"""
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+def _success_rate(successes: int, failures: int) -> float:
+    """Percentage of successes, or 0 when there were no attempts"""
+    attempts = successes + failures
+    if not attempts:
+        return 0
+    return successes / attempts * 100
+
+
+# Event write batching: the flusher writes up to EVENT_BATCH_SIZE queued events
+# per transaction, waiting at most EVENT_BATCH_WAIT seconds to fill a batch
+EVENT_BATCH_SIZE = 256
+EVENT_BATCH_WAIT = 0.2
+
+# Statements run on every call, defined once (they also key sqlite3's per-connection statement cache)
+_SQL_INSERT_FEEDBACK = (
+    "INSERT INTO feedback (feedback_type, content, rating, metadata, timestamp, user_id) VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SQL_INSERT_EVENT = "INSERT INTO events (event_type, data, timestamp, session_id) VALUES (?, ?, ?, ?)"
+_SQL_SELECT_USER_ID = "SELECT value FROM preferences WHERE key = 'anonymous_user_id'"
+_SQL_INSERT_PREFERENCE = "INSERT INTO preferences (key, value, updated_at) VALUES (?, ?, ?)"
+_SQL_DELETE_OLD_FEEDBACK = "DELETE FROM feedback WHERE timestamp < ?"
+_SQL_DELETE_OLD_EVENTS = "DELETE FROM events WHERE timestamp < ?"
+_SQL_FEEDBACK_STATS_BY_TYPE = (
+    "SELECT feedback_type, COUNT(*), SUM(rating), COUNT(rating) FROM feedback GROUP BY feedback_type"
+)
+_SQL_RECENT_FEEDBACK = "SELECT feedback_type, content, rating, timestamp FROM feedback ORDER BY timestamp DESC LIMIT 5"
+_SQL_COUNT_EVENTS_BY_TYPE = "SELECT event_type, COUNT(*) FROM events GROUP BY event_type"
+_SQL_COUNT_SESSIONS = "SELECT COUNT(DISTINCT session_id) FROM events"
+
+# Host identity used for the session and anonymous user IDs; read once, it does not change
+_PLATFORM_NODE = platform.node()
+_PLATFORM_SYSTEM = platform.system()
+_PLATFORM_MACHINE = platform.machine()
+
+# PRAGMA user_version of the current schema. Version 0 stored timestamps as ISO 8601 TEXT.
+SCHEMA_VERSION = 1
 
 
 class FeedbackManager:
     """Manages user feedback and analytics"""
     
+    # Anonymous user ID per database path, so only the first manager reads it
+    _user_id_cache: Dict[str, str] = {}
+    
     def __init__(self, db_path: Optional[Path] = None):
         """
         Initialize feedback manager
@@ -82,13 +152,22 @@ def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # One long-lived connection, shared by all threads and serialized by the lock
+        self._conn_lock = threading.Lock()
+        self._conn = self._connect()
         self._init_database()
-        self.session_id = self._generate_session_id()
+        self._session_id: Optional[str] = None  # Generated on first use, see session_id
         self.anonymous_user_id = self._get_anonymous_user_id()
         
+        # track_event only queues rows; a background thread writes them in batches
+        self._event_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._flusher = threading.Thread(target=self._flush_loop, name="FeedbackFlusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)  # Write out queued events on app exit
+        
     def _get_default_db_path(self) -> Path:
         """Get default database path based on OS"""
-        system = platform.system()
+        system = _PLATFORM_SYSTEM
         
         if system == "Windows":
             base = Path.home() / "AppData" / "Local"
@@ -99,12 +178,76 @@ def _get_default_db_path(self) -> Path:
             
         return base / "OpenSuperWhisper" / "feedback.db"
         
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database connection used for the manager's lifetime"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+        conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL; no fsync per commit
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache, kept warm between calls
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+        
+    def close(self):
+        """Write out queued events, stop the flusher and close the database connection"""
+        if self._flusher.is_alive():
+            self._event_queue.put(None)
+            self._flusher.join()
+        with self._conn_lock:
+            self._conn.close()
+            
+    def flush(self):
+        """Block until every event queued so far has been written"""
+        if self._flusher.is_alive():
+            written = threading.Event()
+            self._event_queue.put(written)
+            written.wait()
+            
+    def _flush_loop(self):
+        """Flusher thread: write queued events in batches, one transaction per batch"""
+        while True:
+            item = self._event_queue.get()
+            rows = []
+            deadline = time.monotonic() + EVENT_BATCH_WAIT
+            # Collect a batch until it is full, the wait expires, or a flush/stop marker arrives
+            while isinstance(item, tuple):
+                rows.append(item)
+                if len(rows) >= EVENT_BATCH_SIZE:
+                    item = False
+                    break
+                try:
+                    item = self._event_queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    item = False
+                    
+            if rows:
+                try:
+                    with self._conn_lock, self._conn as conn:
+                        conn.executemany(_SQL_INSERT_EVENT, rows)
+                except Exception as e:
+                    print(f"Error tracking event: {e}")
+                    
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is None:
+                return
+            
     def _init_database(self):
         """Initialize SQLite database tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn_lock, self._conn as conn:
             cursor = conn.cursor()
+            cursor.execute("BEGIN")  # Create and migrate atomically
+            
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                # Move version 0 tables aside; their rows are converted below
+                for table in ("feedback", "events"):
+                    if cursor.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+                    ).fetchone():
+                        cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_v0")
             
-            # Feedback table
+            # Feedback table (timestamps are Unix epoch seconds)
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS feedback (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -112,7 +255,7 @@ def _init_database(self):
                     content TEXT NOT NULL,
                     rating INTEGER,
                     metadata TEXT,
-                    timestamp TEXT NOT NULL,
+                    timestamp REAL NOT NULL,
                     user_id TEXT,
                     synced BOOLEAN DEFAULT FALSE
                 )
@@ -124,7 +267,7 @@ def _init_database(self):
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     event_type TEXT NOT NULL,
                     data TEXT,
-                    timestamp TEXT NOT NULL,
+                    timestamp REAL NOT NULL,
                     session_id TEXT,
                     synced BOOLEAN DEFAULT FALSE
                 )
@@ -139,42 +282,73 @@ def _init_database(self):
                 )
             """)
             
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON feedback (timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_type ON events (event_type)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_session ON events (session_id)")
+            
+            if version < 1:
+                # Convert local-time ISO strings to epoch seconds (in Python: SQLite's
+                # date functions only keep milliseconds)
+                conn.create_function("iso_to_epoch", 1, lambda iso: datetime.fromisoformat(iso).timestamp())
+                epoch = "iso_to_epoch(timestamp)"
+                for table, columns in (
+                    ("feedback", "id, feedback_type, content, rating, metadata, {ts}, user_id, synced"),
+                    ("events", "id, event_type, data, {ts}, session_id, synced"),
+                ):
+                    if cursor.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{table}_v0",)
+                    ).fetchone():
+                        cursor.execute(
+                            f"INSERT INTO {table} ({columns.format(ts='timestamp')}) "
+                            f"SELECT {columns.format(ts=epoch)} FROM {table}_v0"
+                        )
+                        cursor.execute(f"DROP TABLE {table}_v0")
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            
             conn.commit()
             
+    @property
+    def session_id(self) -> str:
+        """Session ID for this manager, generated when the first event is tracked"""
+        if self._session_id is None:
+            self._session_id = self._generate_session_id()
+        return self._session_id
+        
     def _generate_session_id(self) -> str:
         """Generate unique session ID"""
-        timestamp = datetime.now().isoformat()
-        machine_id = platform.node()
+        timestamp = time.time()
+        machine_id = _PLATFORM_NODE
         session_str = f"{timestamp}_{machine_id}"
-        # Use SHA256 instead of MD5 for better security
-        return hashlib.sha256(session_str.encode()).hexdigest()[:16]
+        # BLAKE2b sized to the 16 hex chars kept, rather than truncating a SHA-256 digest
+        return hashlib.blake2b(session_str.encode(), digest_size=8).hexdigest()
         
     def _get_anonymous_user_id(self) -> str:
         """Get or create anonymous user ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        cache_key = str(self.db_path)
+        user_id = self._user_id_cache.get(cache_key)
+        if user_id is not None:
+            return user_id
             
+        with self._conn_lock, self._conn as conn:
             # Check if user ID exists
-            cursor.execute(
-                "SELECT value FROM preferences WHERE key = 'anonymous_user_id'"
-            )
-            result = cursor.fetchone()
+            result = conn.execute(_SQL_SELECT_USER_ID).fetchone()
             
             if result:
-                return result[0]
+                user_id = result[0]
             else:
                 # Generate new user ID
-                machine_info = f"{platform.node()}_{platform.system()}_{platform.machine()}"
-                user_id = hashlib.sha256(machine_info.encode()).hexdigest()[:32]
+                machine_info = f"{_PLATFORM_NODE}_{_PLATFORM_SYSTEM}_{_PLATFORM_MACHINE}"
+                user_id = hashlib.blake2b(machine_info.encode(), digest_size=16).hexdigest()
                 
                 # Store user ID
-                cursor.execute(
-                    "INSERT INTO preferences (key, value, updated_at) VALUES (?, ?, ?)",
+                conn.execute(
+                    _SQL_INSERT_PREFERENCE,
                     ('anonymous_user_id', user_id, datetime.now().isoformat())
                 )
-                conn.commit()
                 
-                return user_id
+        self._user_id_cache[cache_key] = user_id
+        return user_id
                 
     def submit_feedback(
         self,
@@ -204,24 +378,18 @@ def submit_feedback(
         )
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO feedback 
-                    (feedback_type, content, rating, metadata, timestamp, user_id)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
+            with self._conn_lock, self._conn as conn:
+                conn.execute(
+                    _SQL_INSERT_FEEDBACK,
                     (
                         feedback.feedback_type.value,
                         feedback.content,
                         feedback.rating,
-                        json.dumps(feedback.metadata) if feedback.metadata else None,
-                        feedback.timestamp.isoformat(),
+                        _encode_json(feedback.metadata) if feedback.metadata else None,
+                        feedback.timestamp,
                         feedback.user_id
                     )
                 )
-                conn.commit()
                 return True
         except Exception as e:
             print(f"Error submitting feedback: {e}")
@@ -235,6 +403,9 @@ def track_event(
         """
         Track analytics event
         
+        The event is written to the database in the background; call flush()
+        to wait for it.
+        
         Args:
             event_type: Type of event
             data: Event data
@@ -249,62 +420,48 @@ def track_event(
         )
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO events (event_type, data, timestamp, session_id)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (
-                        event.event_type.value,
-                        json.dumps(event.data) if event.data else None,
-                        event.timestamp.isoformat(),
-                        event.session_id
-                    )
-                )
-                conn.commit()
-                return True
+            # Serialize here so bad data is still reported to the caller
+            self._event_queue.put((
+                event.event_type.value,
+                _encode_json(event.data) if event.data else None,
+                event.timestamp,
+                event.session_id
+            ))
+            return True
         except Exception as e:
             print(f"Error tracking event: {e}")
             return False
             
     def get_feedback_summary(self) -> Dict[str, Any]:
         """Get summary of collected feedback"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Total feedback count
-            cursor.execute("SELECT COUNT(*) FROM feedback")
-            total_feedback = cursor.fetchone()[0]
+        with self._conn_lock, self._conn as conn:
+            # All reads share one transaction, so they see a single consistent snapshot
+            conn.execute("BEGIN")
             
-            # Feedback by type
-            cursor.execute("""
-                SELECT feedback_type, COUNT(*) 
-                FROM feedback 
-                GROUP BY feedback_type
-            """)
-            feedback_by_type = dict(cursor.fetchall())
+            # Counts and rating totals by type in a single scan; the overall
+            # count and average rating are derived from them
+            rows = conn.execute(_SQL_FEEDBACK_STATS_BY_TYPE)
+            feedback_by_type = {}
+            total_feedback = 0
+            rating_sum = 0
+            rating_count = 0
+            for feedback_type, count, type_rating_sum, type_rating_count in rows:
+                feedback_by_type[feedback_type] = count
+                total_feedback += count
+                if type_rating_count:
+                    rating_sum += type_rating_sum
+                    rating_count += type_rating_count
+            avg_rating = rating_sum / rating_count if rating_count else None
             
-            # Average rating
-            cursor.execute("SELECT AVG(rating) FROM feedback WHERE rating IS NOT NULL")
-            avg_rating = cursor.fetchone()[0]
-            
-            # Recent feedback
-            cursor.execute("""
-                SELECT feedback_type, content, rating, timestamp
-                FROM feedback
-                ORDER BY timestamp DESC
-                LIMIT 5
-            """)
+            # Recent feedback (walks idx_feedback_timestamp backwards)
             recent_feedback = [
                 {
                     'type': row[0],
                     'content': row[1],
                     'rating': row[2],
-                    'timestamp': row[3]
+                    'timestamp': _isoformat(row[3])
                 }
-                for row in cursor.fetchall()
+                for row in conn.execute(_SQL_RECENT_FEEDBACK)
             ]
             
             return {
@@ -316,45 +473,27 @@ def get_feedback_summary(self) -> Dict[str, Any]:
             
     def get_analytics_summary(self) -> Dict[str, Any]:
         """Get analytics summary"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Total events
-            cursor.execute("SELECT COUNT(*) FROM events")
-            total_events = cursor.fetchone()[0]
+        self.flush()
+        with self._conn_lock, self._conn as conn:
+            conn.execute("BEGIN")  # Both reads share one transaction
             
-            # Events by type
-            cursor.execute("""
-                SELECT event_type, COUNT(*) 
-                FROM events 
-                GROUP BY event_type
-            """)
-            events_by_type = dict(cursor.fetchall())
+            # Events by type (one pass over idx_events_type); the totals and
+            # success rates are derived from these counts
+            events_by_type = dict(conn.execute(_SQL_COUNT_EVENTS_BY_TYPE))
+            total_events = sum(events_by_type.values())
             
             # Sessions count
-            cursor.execute("SELECT COUNT(DISTINCT session_id) FROM events")
-            total_sessions = cursor.fetchone()[0]
+            total_sessions = conn.execute(_SQL_COUNT_SESSIONS).fetchone()[0]
             
             # Success rates
-            cursor.execute("""
-                SELECT 
-                    SUM(CASE WHEN event_type = 'transcription_success' THEN 1 ELSE 0 END),
-                    SUM(CASE WHEN event_type = 'transcription_failure' THEN 1 ELSE 0 END),
-                    SUM(CASE WHEN event_type = 'formatting_success' THEN 1 ELSE 0 END),
-                    SUM(CASE WHEN event_type = 'formatting_failure' THEN 1 ELSE 0 END)
-                FROM events
-            """)
-            success_counts = cursor.fetchone()
-            
-            transcription_success_rate = 0
-            if success_counts[0] or success_counts[1]:
-                total_transcriptions = (success_counts[0] or 0) + (success_counts[1] or 0)
-                transcription_success_rate = (success_counts[0] or 0) / total_transcriptions * 100
-                
-            formatting_success_rate = 0
-            if success_counts[2] or success_counts[3]:
-                total_formatting = (success_counts[2] or 0) + (success_counts[3] or 0)
-                formatting_success_rate = (success_counts[2] or 0) / total_formatting * 100
+            transcription_success_rate = _success_rate(
+                events_by_type.get('transcription_success', 0),
+                events_by_type.get('transcription_failure', 0)
+            )
+            formatting_success_rate = _success_rate(
+                events_by_type.get('formatting_success', 0),
+                events_by_type.get('formatting_failure', 0)
+            )
                 
             return {
                 'total_events': total_events,
@@ -374,33 +513,43 @@ def export_feedback(self, output_path: Path) -> bool:
         Returns:
             Success status
         """
+        output_path = Path(output_path)
+        tmp_path = output_path.with_name(output_path.name + '.tmp')
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
+            with self._conn_lock, self._conn as conn:
+                rows = conn.execute("""
                     SELECT * FROM feedback
                     ORDER BY timestamp DESC
                 """)
                 
-                feedback_list = []
-                for row in cursor.fetchall():
-                    feedback_list.append({
-                        'id': row[0],
-                        'type': row[1],
-                        'content': row[2],
-                        'rating': row[3],
-                        'metadata': json.loads(row[4]) if row[4] else None,
-                        'timestamp': row[5],
-                        'user_id': row[6],
-                        'synced': row[7]
-                    })
+                # Stream rows straight from the query into a sibling temp file so memory
+                # stays bounded; it replaces output_path only once the export is complete
+                with open(tmp_path, 'wb') as f:
+                    f.write(b'[')
+                    separator = b'\n'
+                    for row in rows:
+                        f.write(separator)
+                        f.write(_encode_export_entry({
+                            'id': row[0],
+                            'type': row[1],
+                            'content': row[2],
+                            'rating': row[3],
+                            'metadata': _decode_json(row[4]) if row[4] else None,
+                            'timestamp': _isoformat(row[5]),
+                            'user_id': row[6],
+                            'synced': row[7]
+                        }))
+                        separator = b',\n'
+                    f.write(b'\n]\n')
                     
-            with open(output_path, 'w') as f:
-                json.dump(feedback_list, f, indent=2, default=str)
-                
+            os.replace(tmp_path, output_path)
             return True
         except Exception as e:
             print(f"Error exporting feedback: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
             return False
             
     def clear_old_data(self, days: int = 90) -> bool:
@@ -414,25 +563,17 @@ def clear_old_data(self, days: int = 90) -> bool:
             Success status
         """
         try:
-            cutoff_date = datetime.now().timestamp() - (days * 24 * 60 * 60)
-            cutoff_date_str = datetime.fromtimestamp(cutoff_date).isoformat()
+            self.flush()
+            cutoff_date = time.time() - (days * 24 * 60 * 60)
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
+            # Both deletes are index range scans on timestamp and commit (or
+            # roll back) together when the connection context exits
+            with self._conn_lock, self._conn as conn:
                 # Clear old feedback
-                cursor.execute(
-                    "DELETE FROM feedback WHERE timestamp < ?",
-                    (cutoff_date_str,)
-                )
+                conn.execute(_SQL_DELETE_OLD_FEEDBACK, (cutoff_date,))
                 
                 # Clear old events
-                cursor.execute(
-                    "DELETE FROM events WHERE timestamp < ?",
-                    (cutoff_date_str,)
-                )
-                
-                conn.commit()
+                conn.execute(_SQL_DELETE_OLD_EVENTS, (cutoff_date,))
                 
             return True
         except Exception as e:
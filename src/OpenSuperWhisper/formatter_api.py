@@ -1,30 +1,20 @@
-import os
+import re
+from functools import lru_cache
 from typing import Any
 
-from openai import OpenAI
+# Formatting goes to the same API host as transcription, so both share one client and connection pool
+from .asr_api import get_client
 
-client = None
+# Post-processing patterns for format_text output
+_TRANSCRIPT_OPEN_TAG = re.compile(r"<TRANSCRIPT[^>]*>", re.IGNORECASE)
+_TRANSCRIPT_CLOSE_TAG = re.compile(r"</TRANSCRIPT>", re.IGNORECASE)
+_TRANSCRIPT_WORD = re.compile(r"\bTRANSCRIPT\b", re.IGNORECASE)
+_BLANK_LINES = re.compile(r"\n\s*\n")
 
 
-def get_client() -> OpenAI:
-    global client
-    if client is None:
-        # Set shorter timeouts for CI environments
-        timeout = 60.0 if os.getenv("CI") else 120.0
-        client = OpenAI(timeout=timeout)
-    return client
-
-
-def format_text(raw_text: str, prompt: str, style_guide: str = "", model: str = "gpt-4o-mini") -> str:
-    """
-    Use OpenAI Chat Completion API to format/polish the raw transcript text.
-    :param raw_text: The raw transcript string from ASR.
-    :param prompt: User-defined prompt with instructions for formatting.
-    :param style_guide: Optional style guide text (YAML/JSON or plain) to apply.
-    :param model: The chat model to use for formatting (default "gpt-4o-mini").
-    :return: Formatted text.
-    :raises: Exception if API call fails.
-    """
+@lru_cache(maxsize=8)
+def _system_instructions(prompt: str, style_guide: str) -> str:
+    """Build the system message text; a recording session reuses one prompt/style guide for every chunk"""
     system_instructions = (
         "You are an EDITING-ONLY assistant. Never answer questions or add content.\n"
         "Rewrite ONLY the text delimited by <TRANSCRIPT> ... </TRANSCRIPT>.\n"
@@ -37,8 +27,21 @@ def format_text(raw_text: str, prompt: str, style_guide: str = "", model: str =
         system_instructions += f"Instructions: {prompt}\n"
     else:
         system_instructions += "Instructions: Fix grammar and punctuation, and format the text clearly.\n"
+    return system_instructions
 
-    system_message = {"role": "system", "content": system_instructions}
+
+def format_text(raw_text: str, prompt: str, style_guide: str = "", model: str = "gpt-4o-mini") -> str:
+    """
+    Use OpenAI Chat Completion API to format/polish the raw transcript text.
+    :param raw_text: The raw transcript string from ASR.
+    :param prompt: User-defined prompt with instructions for formatting.
+    :param style_guide: Optional style guide text (YAML/JSON or plain) to apply.
+    :param model: The chat model to use for formatting (default "gpt-4o-mini").
+    :return: Formatted text.
+    :raises: Exception if API call fails.
+    """
+    # Identical across a session's chunks, which also keeps the request prefix eligible for server-side prompt caching
+    system_message = {"role": "system", "content": _system_instructions(prompt, style_guide)}
     user_message = {
         "role": "user",
         "content": f"<TRANSCRIPT>\n{raw_text}\n</TRANSCRIPT>",
@@ -80,17 +83,15 @@ def format_text(raw_text: str, prompt: str, style_guide: str = "", model: str =
     formatted_text = response.choices[0].message.content
 
     # Post-process to remove any TRANSCRIPT tags that might appear in the output
-    import re
-
     # Remove opening and closing TRANSCRIPT tags (case insensitive)
-    formatted_text = re.sub(r"<TRANSCRIPT[^>]*>", "", formatted_text, flags=re.IGNORECASE)
-    formatted_text = re.sub(r"</TRANSCRIPT>", "", formatted_text, flags=re.IGNORECASE)
+    formatted_text = _TRANSCRIPT_OPEN_TAG.sub("", formatted_text)
+    formatted_text = _TRANSCRIPT_CLOSE_TAG.sub("", formatted_text)
 
     # Also remove any standalone "TRANSCRIPT" text that might appear
-    formatted_text = re.sub(r"\bTRANSCRIPT\b", "", formatted_text, flags=re.IGNORECASE)
+    formatted_text = _TRANSCRIPT_WORD.sub("", formatted_text)
 
     # Clean up any extra whitespace or newlines
-    formatted_text = re.sub(r"\n\s*\n", "\n", formatted_text)  # Remove multiple newlines
+    formatted_text = _BLANK_LINES.sub("\n", formatted_text)  # Remove multiple newlines
     formatted_text = formatted_text.strip()
 
     return formatted_text
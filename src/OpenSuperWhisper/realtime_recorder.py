@@ -3,8 +3,8 @@
 Handles chunk-based recording with overlap for real-time transcription
 """
 
+import threading
 import time
-from collections import deque
 
 import numpy as np
 
@@ -22,7 +22,11 @@ def __init__(self, sample_rate: int = 16000):
             sample_rate: Audio sample rate (default: 16000 Hz for Whisper)
         """
         self.sample_rate = sample_rate
-        self.current_chunk: list[np.ndarray] = []
+        # Samples of the chunk being recorded, written in place into a preallocated buffer
+        self.chunk_buffer: np.ndarray = np.empty(0, dtype=np.float32)
+        self.chunk_length: int = 0
+        # The audio callback appends while the GUI thread cuts chunks
+        self._buffer_lock = threading.Lock()
         self.chunk_start_time: float = 0.0
         self.chunk_id: int = 0
         self.recording_start_time: float = 0.0
@@ -40,9 +44,11 @@ def __init__(self, sample_rate: int = 16000):
         self.MIN_SILENCE_DURATION = 1.5  # Minimum silence duration for split
         self.SHORT_SILENCE_DURATION = 0.5  # Short silence for priority split
 
-        # Buffer for silence detection
+        # Silence detection looks at most this far back into the current chunk
         self.silence_buffer_size = int(2.5 * sample_rate)  # 2.5 seconds buffer
-        self.recent_audio: deque[float] = deque(maxlen=self.silence_buffer_size)
+
+        # Room for a full-length chunk plus overlap, so appends normally never reallocate
+        self.chunk_capacity = int((self.MAX_CHUNK_DURATION + 10.0) * sample_rate)
 
         logger.logger.info("RealtimeRecorder initialized")
 
@@ -52,7 +58,7 @@ def start_recording(self) -> None:
         self.recording_start_time = time.time()
         self.chunk_start_time = self.recording_start_time
         self.chunk_id = 0
-        self.current_chunk = []
+        self._reset_chunk_buffer()
         self.overlap_buffer = None
         logger.logger.info("Started realtime recording session")
 
@@ -66,8 +72,9 @@ def stop_recording(self) -> tuple[int, np.ndarray] | None:
         self.is_recording = False
 
         # Return remaining audio as final chunk
-        if self.current_chunk:
+        with self._buffer_lock:
             audio_data = self._combine_chunk_data()
+        if len(audio_data):
             chunk_id = self.chunk_id
             logger.logger.info(f"Final chunk {chunk_id} with {len(audio_data)/self.sample_rate:.2f}s")
             return (chunk_id, audio_data)
@@ -84,19 +91,39 @@ def add_audio_data(self, audio_data: np.ndarray) -> tuple[int, np.ndarray] | Non
         Returns:
             Tuple of (chunk_id, audio_data) if chunk is ready, None otherwise
         """
+        self.append_audio_data(audio_data)
+        return self.poll_chunk()
+
+    def append_audio_data(self, audio_data: np.ndarray) -> None:
+        """
+        Add audio data to current chunk without checking for a chunk boundary
+
+        Cheap enough to call from the audio callback; pair it with poll_chunk
+        on another thread.
+
+        Args:
+            audio_data: New audio samples to add (copied, so callers may reuse the array)
+        """
         if not self.is_recording:
-            return None
+            return
 
-        # Add to current chunk
-        self.current_chunk.append(audio_data.copy())
+        with self._buffer_lock:
+            self._append_samples(audio_data)
 
-        # Update recent audio buffer for silence detection
-        self.recent_audio.extend(audio_data)
+    def poll_chunk(self) -> tuple[int, np.ndarray] | None:
+        """
+        Finalize the current chunk if a chunk boundary has been reached
+
+        Returns:
+            Tuple of (chunk_id, audio_data) if chunk is ready, None otherwise
+        """
+        if not self.is_recording:
+            return None
 
-        # Check chunk boundary
         current_time = time.time()
-        if self.check_chunk_boundary(current_time):
-            return self._finalize_current_chunk(current_time)
+        with self._buffer_lock:
+            if self.check_chunk_boundary(current_time):
+                return self._finalize_current_chunk(current_time)
 
         return None
 
@@ -149,18 +176,16 @@ def detect_silence(self, duration: float) -> bool:
         Returns:
             True if silence detected
         """
-        if not self.recent_audio:
+        if not self.chunk_length:
             return False
 
-        # Convert deque to numpy array for analysis
-        audio_array = np.array(self.recent_audio)
         required_samples = int(duration * self.sample_rate)
 
-        if len(audio_array) < required_samples:
+        if min(self.chunk_length, self.silence_buffer_size) < required_samples:
             return False
 
-        # Check the most recent samples
-        recent_samples = audio_array[-required_samples:]
+        # Check the most recent samples (a view of the chunk buffer, no copy)
+        recent_samples = self.chunk_buffer[self.chunk_length - required_samples : self.chunk_length]
 
         # Calculate RMS (Root Mean Square) for better silence detection
         rms = np.sqrt(np.mean(recent_samples**2))
@@ -213,11 +238,11 @@ def _finalize_current_chunk(self, current_time: float) -> tuple[int, np.ndarray]
         # Prepare for next chunk
         self.chunk_id += 1
         self.chunk_start_time = current_time
-        self.current_chunk = []
+        self._reset_chunk_buffer()  # audio_data keeps the previous buffer alive
 
         # Add overlap data to next chunk
         if next_start_data is not None:
-            self.current_chunk.append(next_start_data)
+            self._append_samples(next_start_data)
 
         logger.logger.info(f"Finalized chunk {current_chunk_id}: " f"{len(chunk_data)/self.sample_rate:.2f}s of audio")
 
@@ -255,11 +280,23 @@ def create_chunk_with_overlap(
             return chunk_data, None
 
     def _combine_chunk_data(self) -> np.ndarray:
-        """Combine all audio arrays in current chunk into single array"""
-        if not self.current_chunk:
-            return np.array([], dtype=np.float32)
-
-        return np.concatenate(self.current_chunk)
+        """Return the current chunk's audio as one contiguous array (a view of the chunk buffer)"""
+        return self.chunk_buffer[: self.chunk_length]
+
+    def _reset_chunk_buffer(self) -> None:
+        """Start an empty chunk in a fresh buffer, leaving views of the old one intact"""
+        self.chunk_buffer = np.empty(self.chunk_capacity, dtype=np.float32)
+        self.chunk_length = 0
+
+    def _append_samples(self, audio_data: np.ndarray) -> None:
+        """Copy samples onto the end of the chunk buffer, growing it if a chunk runs long"""
+        end = self.chunk_length + len(audio_data)
+        if end > len(self.chunk_buffer):
+            grown = np.empty(max(end, 2 * len(self.chunk_buffer)), dtype=np.float32)
+            grown[: self.chunk_length] = self.chunk_buffer[: self.chunk_length]
+            self.chunk_buffer = grown
+        self.chunk_buffer[self.chunk_length : end] = audio_data
+        self.chunk_length = end
 
     def _find_optimal_split_point(self, audio_data: np.ndarray, chunk_duration: float | None = None) -> int:
         """
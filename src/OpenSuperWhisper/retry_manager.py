@@ -3,8 +3,10 @@
 Manages retry logic for failed chunk processing
 """
 
+import heapq
 import threading
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
@@ -31,6 +33,20 @@ class RetryConfig:
     strategy: RetryStrategy = RetryStrategy.FIXED_DELAY
 
 
+def _exponential_delay(config: RetryConfig, retry_count: int) -> float:
+    """Exponential backoff: base_delay * 2^retry_count, capped at max_delay"""
+    delay = config.base_delay * (2**retry_count)
+    return float(min(delay, config.max_delay))
+
+
+# Delay calculation per strategy; strategies without an entry use base_delay
+_DELAY_FUNCTIONS: dict[RetryStrategy, Callable[[RetryConfig, int], float]] = {
+    RetryStrategy.IMMEDIATE: lambda config, retry_count: 0.0,
+    RetryStrategy.FIXED_DELAY: lambda config, retry_count: config.base_delay,
+    RetryStrategy.EXPONENTIAL: _exponential_delay,
+}
+
+
 class RetryManager:
     """Manages retry operations for failed chunks"""
 
@@ -46,12 +62,23 @@ class RetryManager:
         "default": RetryConfig(max_retries=1, base_delay=10.0, strategy=RetryStrategy.FIXED_DELAY),
     }
 
+    # Lowercased once with the class, in ERROR_RETRY_CONFIG's priority order
+    _ERROR_PATTERNS = tuple((pattern.lower(), config) for pattern, config in ERROR_RETRY_CONFIG.items())
+
     def __init__(self) -> None:
         """Initialize retry manager"""
-        self.retry_queue: list[tuple[int, float]] = []  # (chunk_id, retry_time)
+        self.retry_queue: list[tuple[float, int]] = []  # Min-heap of (retry_time, chunk_id)
+        # Removed chunks are tombstoned rather than filtered out of the heap; their
+        # entries are skipped when popped and the heap is compacted once they pile up
+        self._queued: dict[int, int] = {}  # chunk_id -> entries in retry_queue
+        self._cancelled: set[int] = set()  # chunk_ids whose queued entries are stale
+        self._stale_entries = 0
         self.retry_counts: dict[int, int] = {}  # chunk_id -> retry count
         self.retry_lock = threading.Lock()
         self.is_active = True
+        # Immutable copy of (retry_queue, retry_counts), republished under retry_lock
+        # after every mutation so status reads never contend with scheduling
+        self._snapshot: tuple[tuple[tuple[float, int], ...], dict[int, int]] = ((), {})
 
         logger.logger.info("RetryManager initialized")
 
@@ -72,6 +99,10 @@ def should_retry(self, chunk_id: int, error: str) -> bool:
         # Get retry configuration for error type
         config = self._get_retry_config(error)
 
+        return self._can_retry(chunk_id, error, config, current_retries)
+
+    def _can_retry(self, chunk_id: int, error: str, config: RetryConfig, current_retries: int) -> bool:
+        """should_retry for an already classified error"""
         # Check if retries exhausted
         if current_retries >= config.max_retries:
             logger.logger.info(f"Chunk {chunk_id} exceeded max retries ({config.max_retries})")
@@ -95,11 +126,11 @@ def schedule_retry(self, chunk_id: int, error: str) -> float | None:
         Returns:
             Retry time if scheduled, None otherwise
         """
-        if not self.should_retry(chunk_id, error):
-            return None
-
+        # Classify once; should_retry would repeat the lookup
         config = self._get_retry_config(error)
         current_retries = self.retry_counts.get(chunk_id, 0)
+        if not self._can_retry(chunk_id, error, config, current_retries):
+            return None
 
         # Calculate delay
         delay = self._calculate_delay(config, current_retries)
@@ -107,8 +138,13 @@ def schedule_retry(self, chunk_id: int, error: str) -> float | None:
 
         # Add to retry queue
         with self.retry_lock:
-            self.retry_queue.append((chunk_id, retry_time))
+            if chunk_id in self._cancelled:
+                # Drop the stale entries first so the tombstone doesn't swallow this retry
+                self._compact()
+            heapq.heappush(self.retry_queue, (retry_time, chunk_id))
+            self._queued[chunk_id] = self._queued.get(chunk_id, 0) + 1
             self.retry_counts[chunk_id] = current_retries + 1
+            self._publish_snapshot()
 
         logger.logger.info(
             f"Scheduled chunk {chunk_id} for retry in {delay:.1f}s "
@@ -131,15 +167,22 @@ def get_ready_retries(self) -> list[int]:
         ready_chunks = []
 
         with self.retry_lock:
-            # Find chunks ready for retry
-            remaining_queue = []
-            for chunk_id, retry_time in self.retry_queue:
-                if retry_time <= current_time:
-                    ready_chunks.append(chunk_id)
+            # Pop chunks ready for retry; the earliest retry is always at the top
+            popped = False
+            while self.retry_queue and self.retry_queue[0][0] <= current_time:
+                chunk_id = heapq.heappop(self.retry_queue)[1]
+                popped = True
+                remaining = self._queued.pop(chunk_id) - 1
+                if remaining:
+                    self._queued[chunk_id] = remaining
+                if chunk_id in self._cancelled:
+                    self._stale_entries -= 1
+                    if not remaining:
+                        self._cancelled.discard(chunk_id)
                 else:
-                    remaining_queue.append((chunk_id, retry_time))
-
-            self.retry_queue = remaining_queue
+                    ready_chunks.append(chunk_id)
+            if popped:
+                self._publish_snapshot()
 
         if ready_chunks:
             logger.logger.info(f"Chunks ready for retry: {ready_chunks}")
@@ -149,10 +192,14 @@ def get_ready_retries(self) -> list[int]:
     def cancel_all_retries(self) -> None:
         """Cancel all pending retries"""
         with self.retry_lock:
-            cancelled_count = len(self.retry_queue)
+            cancelled_count = len(self.retry_queue) - self._stale_entries
             self.retry_queue.clear()
+            self._queued.clear()
+            self._cancelled.clear()
+            self._stale_entries = 0
             self.retry_counts.clear()
             self.is_active = False
+            self._publish_snapshot()
 
         if cancelled_count > 0:
             logger.logger.info(f"Cancelled {cancelled_count} pending retries")
@@ -160,17 +207,39 @@ def cancel_all_retries(self) -> None:
     def remove_chunk(self, chunk_id: int) -> None:
         """Remove a chunk from retry queue (e.g., if successful)"""
         with self.retry_lock:
-            self.retry_queue = [(cid, rt) for cid, rt in self.retry_queue if cid != chunk_id]
+            if chunk_id in self._queued and chunk_id not in self._cancelled:
+                self._cancelled.add(chunk_id)
+                self._stale_entries += self._queued[chunk_id]
+                if self._stale_entries > len(self.retry_queue) // 2:
+                    self._compact()
             if chunk_id in self.retry_counts:
                 del self.retry_counts[chunk_id]
+            self._publish_snapshot()
+
+    def _compact(self) -> None:
+        """Drop tombstoned entries from the retry queue (retry_lock must be held)"""
+        cancelled = self._cancelled
+        self.retry_queue = [(rt, cid) for rt, cid in self.retry_queue if cid not in cancelled]
+        heapq.heapify(self.retry_queue)
+        for chunk_id in cancelled:
+            del self._queued[chunk_id]
+        cancelled.clear()
+        self._stale_entries = 0
+
+    def _publish_snapshot(self) -> None:
+        """Publish the current queue state for lock-free status reads (retry_lock must be held)"""
+        queue = self.retry_queue
+        if self._stale_entries:
+            queue = [entry for entry in queue if entry[1] not in self._cancelled]
+        self._snapshot = (tuple(queue), dict(self.retry_counts))
 
     def _get_retry_config(self, error: str) -> RetryConfig:
         """Get retry configuration based on error message"""
         error_lower = error.lower()
 
         # Check each error pattern
-        for pattern, config in self.ERROR_RETRY_CONFIG.items():
-            if pattern.lower() in error_lower:
+        for pattern, config in self._ERROR_PATTERNS:
+            if pattern in error_lower:
                 return config
 
         # Return default config
@@ -178,25 +247,25 @@ def _get_retry_config(self, error: str) -> RetryConfig:
 
     def _calculate_delay(self, config: RetryConfig, retry_count: int) -> float:
         """Calculate retry delay based on strategy"""
-        if config.strategy == RetryStrategy.IMMEDIATE:
-            return 0.0
-
-        elif config.strategy == RetryStrategy.FIXED_DELAY:
+        delay_function = _DELAY_FUNCTIONS.get(config.strategy)
+        if delay_function is None:
             return config.base_delay
-
-        elif config.strategy == RetryStrategy.EXPONENTIAL:
-            # Exponential backoff: base_delay * 2^retry_count
-            delay = config.base_delay * (2**retry_count)
-            return float(min(delay, config.max_delay))
-
-        return config.base_delay
+        return delay_function(config, retry_count)
 
     def get_retry_status(self) -> dict[str, Any]:
         """Get current retry queue status"""
-        with self.retry_lock:
-            return {
-                "pending_retries": len(self.retry_queue),
-                "retry_counts": dict(self.retry_counts),
-                "is_active": self.is_active,
-                "queue": [(cid, rt - time.time()) for cid, rt in self.retry_queue],
-            }
+        # Reads the published snapshot without taking retry_lock; the attribute
+        # load is atomic and the snapshot itself is never mutated
+        queue, retry_counts = self._snapshot
+        current_time = time.time()
+        return {
+            "pending_retries": len(queue),
+            "retry_counts": dict(retry_counts),
+            "is_active": self.is_active,
+            "queue": [(cid, rt - current_time) for rt, cid in queue],
+        }
+
+    def next_retry_time(self) -> float | None:
+        """Get the time of the earliest pending retry, or None if nothing is queued"""
+        queue = self._snapshot[0]
+        return min(queue)[0] if queue else None
@@ -146,22 +146,22 @@ async def transcribe_audio(
         raise HTTPException(status_code=500, detail="OpenAI API key not configured")
 
     try:
-        # Save uploaded file to temporary location without loading into memory
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{file.filename}") as temp_file:
+        # Spool the upload to an anonymous temporary file without loading it into memory.
+        # It has no name to clean up: the OS frees it on close (O_TMPFILE on Linux).
+        with tempfile.TemporaryFile() as temp_file:
             await file.seek(0)
             # Stream copy to temp file to avoid memory spikes on large uploads
             import shutil
 
             shutil.copyfileobj(file.file, temp_file)
-            temp_audio_path = temp_file.name
+            file_size = temp_file.tell()
+            temp_file.seek(0)
+            logger.logger.info(f"Processing uploaded file: {file.filename} ({file_size} bytes)")
 
-        file_size = os.path.getsize(temp_audio_path)
-        logger.logger.info(f"Processing uploaded file: {file.filename} ({file_size} bytes)")
-
-        # Stage 1: ASR Transcription
-        logger.logger.info(f"Starting ASR with model: {asr_model}")
-        raw_text = asr_api.transcribe_audio(temp_audio_path, model=asr_model)
-        logger.logger.info(f"ASR completed: {raw_text[:100]}...")
+            # Stage 1: ASR Transcription (the filename's extension tells the API the audio format)
+            logger.logger.info(f"Starting ASR with model: {asr_model}")
+            raw_text = asr_api.transcribe_audio((file.filename or "audio", temp_file), model=asr_model)
+            logger.logger.info(f"ASR completed: {raw_text[:100]}...")
 
         formatted_text = None
         models_used = {"asr": asr_model}
@@ -187,13 +187,6 @@ async def transcribe_audio(
     except Exception as e:
         logger.logger.error(f"Transcription error: {e}")
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}") from e
-    finally:
-        # Cleanup temporary file
-        try:
-            if "temp_audio_path" in locals():
-                os.unlink(temp_audio_path)
-        except Exception as e:
-            logger.logger.warning(f"Failed to cleanup temp file: {e}")
 
 
 @app.post("/format-text")
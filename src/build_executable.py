@@ -1,241 +1,87 @@
 #!/usr/bin/env python3
 """
 Build script for creating executable with PyInstaller
+
+PyInstaller's build/ directory is reused between runs. Set PYINSTALLER_CLEAN=1
+(or FORCE_CLEAN_BUILD=1) to force a clean build, e.g. in CI for release tags;
+other CI runs can cache build/ and .pyi-cache/ between jobs, keyed on the
+requirements files and the application sources.
 """
+import hashlib
 import os
 import platform
 import sys
+from pathlib import Path
 
 import PyInstaller.__main__
 
+SPEC_FILE = Path(__file__).resolve().parent / "opensuperwhisper.spec"
+
+# Key file recording which dependency set the cached PyInstaller Analysis in build/ belongs to
+CACHE_KEY_FILE = Path("build") / ".cache_key"
+
+
+def compute_cache_key() -> str:
+    """Hash the requirements files and interpreter version into a short build cache key"""
+    digest = hashlib.sha256()
+    for requirements in sorted(Path(".").glob("requirements*.txt")):
+        digest.update(requirements.read_bytes())
+    digest.update(sys.version.encode())
+    return digest.hexdigest()[:12]
+
+
+def needs_clean_build() -> bool:
+    """Return True when PyInstaller's cached Analysis cannot be reused
+
+    A clean build is forced via PYINSTALLER_CLEAN/FORCE_CLEAN_BUILD. Otherwise
+    the cache is kept as long as the requirements and Python version are
+    unchanged, which skips re-analysis of the PySide6 module graph.
+    """
+    if os.getenv("PYINSTALLER_CLEAN") or os.getenv("FORCE_CLEAN_BUILD"):
+        return True
+
+    if CACHE_KEY_FILE.exists() and CACHE_KEY_FILE.read_text(encoding="utf-8").strip() == compute_cache_key():
+        return False
+    return True
+
+
+def save_cache_key() -> None:
+    """Record the current dependency set as the one build/ was made with (call only after a successful build)"""
+    CACHE_KEY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    CACHE_KEY_FILE.write_text(compute_cache_key(), encoding="utf-8")
+
 
 def main() -> None:
     executable_name = sys.argv[1] if len(sys.argv) > 1 else "OpenSuperWhisper"
 
-    # Base arguments - Security-focused configuration
+    # Keep PyInstaller's binary/analysis cache next to build/ so both can be cached together
+    os.environ.setdefault("PYINSTALLER_CONFIG_DIR", os.path.abspath(".pyi-cache"))
+
+    # Hidden imports, excludes, platform settings and Qt payload filtering live in the spec
     args = [
-        f"--name={executable_name}",
-        "--onedir",  # Use onedir for all platforms to prevent DLL access violations
-        "--windowed",
-        "--noupx",  # Disable UPX compression globally to prevent false positives
-        "--collect-all=OpenSuperWhisper",
-        "--hidden-import=OpenSuperWhisper",
-        "--hidden-import=OpenSuperWhisper.ui_mainwindow",
-        "--hidden-import=OpenSuperWhisper.asr_api",
-        "--hidden-import=OpenSuperWhisper.formatter_api",
-        "--hidden-import=OpenSuperWhisper.config",
-        "--hidden-import=OpenSuperWhisper.logger",
-        "--hidden-import=OpenSuperWhisper.global_hotkey",
-        "--hidden-import=OpenSuperWhisper.direct_hotkey",
-        "--hidden-import=OpenSuperWhisper.simple_hotkey",
-        "--hidden-import=OpenSuperWhisper.recording_indicator",
-        "--hidden-import=OpenSuperWhisper.first_run",
-        "--hidden-import=OpenSuperWhisper.security",
-        "--hidden-import=PySide6.QtCore",
-        "--hidden-import=PySide6.QtGui",
-        "--hidden-import=PySide6.QtWidgets",
-        "--hidden-import=cryptography",
-        "--hidden-import=cryptography.fernet",
-        "--hidden-import=yaml",
-        "--hidden-import=tempfile",
-        "--hidden-import=certifi",
-        "--hidden-import=ssl",
-        "--hidden-import=urllib3",
-        "--hidden-import=requests",
-        "--collect-all=certifi",
-        "--collect-all=openai",
         "--distpath=dist",
-        "--clean",  # Clean build directory
-        "run_app.py",
+        "--noconfirm",  # Don't ask for confirmation
     ]
 
+    # Reuse the Analysis cache in build/ unless dependencies changed
+    if needs_clean_build():
+        args.append("--clean")
+    else:
+        print("Dependencies unchanged - reusing cached PyInstaller analysis")
+    # Until this build succeeds, build/ must not be trusted by the next run
+    CACHE_KEY_FILE.unlink(missing_ok=True)
+
     # Add CI-specific optimizations and security enhancements
     if os.getenv("CI"):
         print("CI environment detected - adding CI-specific optimizations")
         args.extend(
             [
                 "--log-level=WARN",  # Reduce verbosity for CI
-                "--noconfirm",  # Don't ask for confirmation
             ]
         )
 
-    # Security and compatibility improvements (all environments)
-    args.extend(
-        [
-            "--exclude-module=tkinter",  # Exclude unnecessary modules that may trigger AV
-            "--exclude-module=matplotlib",
-            "--exclude-module=test",
-            "--exclude-module=unittest",
-            "--exclude-module=IPython",
-            "--exclude-module=jupyter",
-            "--exclude-module=notebook",
-            "--exclude-module=scipy",
-            "--exclude-module=pandas",
-            "--exclude-module=sklearn",
-        ]
-    )
-
-    # Only strip on non-Windows platforms (may cause DLL issues on Windows)
-    if platform.system() != "Windows":
-        args.append("--strip")
-
-    # Platform-specific adjustments
-    if platform.system() == "Linux":
-        print("Linux platform detected - adding Linux-specific settings")
-        args.extend(
-            [
-                "--icon=assets/ios/AppIcon.appiconset/Icon-AppStore-1024.png",
-                "--hidden-import=PySide6.QtDBus",
-                # Try to find libportaudio.so.2 in common locations
-                "--collect-all=sounddevice",
-                "--collect-all=PySide6",  # Include plugins/platforms
-                "--add-data=assets:assets",  # Include assets for icons and UI
-            ]
-        )
-        # Try to add portaudio library if it exists
-        portaudio_paths = [
-            "/usr/lib/x86_64-linux-gnu/libportaudio.so.2",
-            "/usr/lib/libportaudio.so.2",
-            "/lib/x86_64-linux-gnu/libportaudio.so.2",
-        ]
-        for path in portaudio_paths:
-            if os.path.exists(path):
-                args.append(f"--add-binary={path}:.")
-                break
-
-    elif platform.system() == "Darwin":  # macOS
-        print("macOS platform detected - adding macOS-specific settings")
-        # Use PNG icon for macOS (PyInstaller can convert with Pillow)
-        # Check if icon file exists before adding it
-        icon_path = "assets/ios/AppIcon.appiconset/Icon-AppStore-1024.png"
-        if os.path.exists(icon_path):
-            args.extend(
-                [
-                    f"--icon={icon_path}",
-                    "--osx-bundle-identifier=com.yutaishy.opensuperwhisper",
-                    "--collect-all=sounddevice",
-                    "--collect-all=PySide6",  # Include Qt plugins/platforms
-                    "--add-data=assets:assets",  # Include assets for icons and UI
-                    # Exclude problematic Qt3D modules that cause framework conflicts on macOS
-                    "--exclude-module=PySide6.Qt3DAnimation",
-                    "--exclude-module=PySide6.Qt3DCore",
-                    "--exclude-module=PySide6.Qt3DExtras",
-                    "--exclude-module=PySide6.Qt3DInput",
-                    "--exclude-module=PySide6.Qt3DLogic",
-                    "--exclude-module=PySide6.Qt3DRender",
-                    "--exclude-module=PySide6.QtCharts",
-                    "--exclude-module=PySide6.QtDataVisualization",
-                    "--exclude-module=PySide6.QtLocation",
-                    "--exclude-module=PySide6.QtMultimedia",
-                    "--exclude-module=PySide6.QtMultimediaWidgets",
-                    "--exclude-module=PySide6.QtNetworkAuth",
-                    "--exclude-module=PySide6.QtPdf",
-                    "--exclude-module=PySide6.QtPdfWidgets",
-                    "--exclude-module=PySide6.QtPositioning",
-                    "--exclude-module=PySide6.QtQuick",
-                    "--exclude-module=PySide6.QtQuick3D",
-                    "--exclude-module=PySide6.QtQuickControls2",
-                    "--exclude-module=PySide6.QtQuickWidgets",
-                    "--exclude-module=PySide6.QtRemoteObjects",
-                    "--exclude-module=PySide6.QtScxml",
-                    "--exclude-module=PySide6.QtSensors",
-                    "--exclude-module=PySide6.QtSpatialAudio",
-                    "--exclude-module=PySide6.QtSql",
-                    "--exclude-module=PySide6.QtStateMachine",
-                    "--exclude-module=PySide6.QtSvg",
-                    "--exclude-module=PySide6.QtSvgWidgets",
-                    "--exclude-module=PySide6.QtTest",
-                    "--exclude-module=PySide6.QtTextToSpeech",
-                    "--exclude-module=PySide6.QtUiTools",
-                    "--exclude-module=PySide6.QtWebChannel",
-                    "--exclude-module=PySide6.QtWebEngine",
-                    "--exclude-module=PySide6.QtWebEngineCore",
-                    "--exclude-module=PySide6.QtWebEngineWidgets",
-                    "--exclude-module=PySide6.QtWebSockets",
-                    # Only include essential PySide6 modules needed for the app
-                    "--hidden-import=PySide6.QtCore",
-                    "--hidden-import=PySide6.QtGui",
-                    "--hidden-import=PySide6.QtWidgets",
-                    "--hidden-import=PySide6.QtNetwork",
-                ]
-            )
-        else:
-            print(f"Warning: Icon file not found at {icon_path}, building without icon")
-            args.extend(
-                [
-                    "--osx-bundle-identifier=com.yutaishy.opensuperwhisper",
-                    "--collect-all=sounddevice",
-                    "--collect-all=PySide6",
-                    "--add-data=assets:assets",
-                    # Exclude problematic Qt3D modules that cause framework conflicts on macOS
-                    "--exclude-module=PySide6.Qt3DAnimation",
-                    "--exclude-module=PySide6.Qt3DCore",
-                    "--exclude-module=PySide6.Qt3DExtras",
-                    "--exclude-module=PySide6.Qt3DInput",
-                    "--exclude-module=PySide6.Qt3DLogic",
-                    "--exclude-module=PySide6.Qt3DRender",
-                    "--exclude-module=PySide6.QtCharts",
-                    "--exclude-module=PySide6.QtDataVisualization",
-                    "--exclude-module=PySide6.QtLocation",
-                    "--exclude-module=PySide6.QtMultimedia",
-                    "--exclude-module=PySide6.QtMultimediaWidgets",
-                    "--exclude-module=PySide6.QtNetworkAuth",
-                    "--exclude-module=PySide6.QtPdf",
-                    "--exclude-module=PySide6.QtPdfWidgets",
-                    "--exclude-module=PySide6.QtPositioning",
-                    "--exclude-module=PySide6.QtQuick",
-                    "--exclude-module=PySide6.QtQuick3D",
-                    "--exclude-module=PySide6.QtQuickControls2",
-                    "--exclude-module=PySide6.QtQuickWidgets",
-                    "--exclude-module=PySide6.QtRemoteObjects",
-                    "--exclude-module=PySide6.QtScxml",
-                    "--exclude-module=PySide6.QtSensors",
-                    "--exclude-module=PySide6.QtSpatialAudio",
-                    "--exclude-module=PySide6.QtSql",
-                    "--exclude-module=PySide6.QtStateMachine",
-                    "--exclude-module=PySide6.QtSvg",
-                    "--exclude-module=PySide6.QtSvgWidgets",
-                    "--exclude-module=PySide6.QtTest",
-                    "--exclude-module=PySide6.QtTextToSpeech",
-                    "--exclude-module=PySide6.QtUiTools",
-                    "--exclude-module=PySide6.QtWebChannel",
-                    "--exclude-module=PySide6.QtWebEngine",
-                    "--exclude-module=PySide6.QtWebEngineCore",
-                    "--exclude-module=PySide6.QtWebEngineWidgets",
-                    "--exclude-module=PySide6.QtWebSockets",
-                    # Only include essential PySide6 modules needed for the app
-                    "--hidden-import=PySide6.QtCore",
-                    "--hidden-import=PySide6.QtGui",
-                    "--hidden-import=PySide6.QtWidgets",
-                    "--hidden-import=PySide6.QtNetwork",
-                ]
-            )
-
-    elif platform.system() == "Windows":
-        print("Windows platform detected - adding Windows-specific settings (onedir mode)")
-        args.extend(
-            [
-                "--icon=assets/windows/osw.ico",
-                "--collect-all=sounddevice",
-                "--collect-all=PySide6",  # Include Qt plugins/platforms
-                "--add-data=assets;assets",  # Include assets for Windows
-            ]
-        )
-        # Add win32 imports if available
-        try:
-            import importlib.util
-
-            if importlib.util.find_spec("win32api"):
-                args.extend(
-                    [
-                        "--hidden-import=win32api",
-                        "--hidden-import=win32con",
-                        "--hidden-import=win32gui",
-                    ]
-                )
-                print("Added win32 imports")
-        except ImportError:
-            print("win32 modules not available, skipping")
+    # Options after "--" are parsed by the spec itself
+    args.extend([str(SPEC_FILE), "--", f"--name={executable_name}"])
 
     print(f"Building executable: {executable_name}")
     print(f"Platform: {platform.system()}")
@@ -243,6 +89,7 @@ def main() -> None:
 
     try:
         PyInstaller.__main__.run(args)
+        save_cache_key()
         print(f"Successfully built executable: {executable_name}")
     except Exception as e:
         print(f"Build failed: {e}")
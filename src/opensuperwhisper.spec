@@ -0,0 +1,232 @@
+# -*- mode: python ; coding: utf-8 -*-
+"""
+PyInstaller spec for OpenSuperWhisper
+
+Invoked by build_executable.py, which passes the executable name after `--`.
+Paths are resolved against the working directory, like the CLI flags this
+spec replaces. Unlike CLI flags, the spec can filter Analysis.datas and
+Analysis.binaries to drop the Qt translations, QML files and unused Qt
+libraries that collect_all("PySide6") drags in.
+"""
+import argparse
+import glob
+import importlib.util
+import os
+import platform
+import re
+
+from PyInstaller.utils.hooks import collect_all
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--name", default="OpenSuperWhisper")
+options = parser.parse_args()
+
+system = platform.system()
+
+hiddenimports = [
+    "OpenSuperWhisper",
+    "OpenSuperWhisper.ui_mainwindow",
+    "OpenSuperWhisper.asr_api",
+    "OpenSuperWhisper.formatter_api",
+    "OpenSuperWhisper.config",
+    "OpenSuperWhisper.logger",
+    "OpenSuperWhisper.global_hotkey",
+    "OpenSuperWhisper.direct_hotkey",
+    "OpenSuperWhisper.simple_hotkey",
+    "OpenSuperWhisper.recording_indicator",
+    "OpenSuperWhisper.first_run",
+    "OpenSuperWhisper.security",
+    "PySide6.QtCore",
+    "PySide6.QtGui",
+    "PySide6.QtWidgets",
+    "cryptography",
+    "cryptography.fernet",
+    "yaml",
+    "tempfile",
+    "certifi",
+    "ssl",
+    "urllib3",
+    "requests",
+]
+collect_packages = ["OpenSuperWhisper", "certifi", "openai", "sounddevice", "PySide6"]
+datas = [(os.path.abspath("assets"), "assets")]  # Icons and UI assets
+binaries = []
+
+# Exclude unnecessary modules that may trigger AV
+excludes = [
+    "tkinter",
+    "matplotlib",
+    "test",
+    "unittest",
+    "IPython",
+    "jupyter",
+    "notebook",
+    "scipy",
+    "pandas",
+    "sklearn",
+    # Build tooling and stdlib leftovers pulled in by the import graph
+    "setuptools",
+    "pip",
+    "distutils",
+    "lib2to3",
+    "pydoc_data",
+    "xmlrpc",
+    "pygments",
+    "PIL.ImageQt",  # Pillow is only used at build time for icons
+    # Qt modules the widget-based UI never loads
+    "PySide6.QtWebEngineCore",
+    "PySide6.QtQml",
+    "PySide6.Qt3DCore",
+    "PySide6.QtCharts",
+    "PySide6.QtMultimedia",
+    # sqlite3 (feedback store), QtNetwork and email/_decimal (HTTP stack) are still needed
+]
+
+icon = None
+
+if system == "Linux":
+    icon = os.path.abspath("assets/ios/AppIcon.appiconset/Icon-AppStore-1024.png")
+    hiddenimports.append("PySide6.QtDBus")
+    # Bundle the system portaudio so sounddevice doesn't depend on the target's copy.
+    # Match any multiarch dir / SONAME variant, preferring the libportaudio.so.2 SONAME
+    # (the name the loader asks for) over versioned or dev symlinks.
+    portaudio_paths = sorted(
+        glob.glob("/usr/lib/*/libportaudio.so*") + glob.glob("/lib/*/libportaudio.so*")
+        + glob.glob("/usr/lib/libportaudio.so*"),
+        key=lambda path: (not path.endswith(".so.2"), path),
+    )
+    for path in portaudio_paths:
+        if os.path.exists(os.path.realpath(path)):
+            binaries.append((path, "."))
+            break
+
+elif system == "Darwin":  # macOS
+    # Use PNG icon for macOS (PyInstaller can convert with Pillow)
+    icon_path = "assets/ios/AppIcon.appiconset/Icon-AppStore-1024.png"
+    if os.path.exists(icon_path):
+        icon = os.path.abspath(icon_path)
+    else:
+        print(f"Warning: Icon file not found at {icon_path}, building without icon")
+    hiddenimports.append("PySide6.QtNetwork")
+    # Exclude problematic Qt3D modules that cause framework conflicts on macOS
+    excludes.extend(
+        [
+            "PySide6.Qt3DAnimation",
+            "PySide6.Qt3DExtras",
+            "PySide6.Qt3DInput",
+            "PySide6.Qt3DLogic",
+            "PySide6.Qt3DRender",
+            "PySide6.QtDataVisualization",
+            "PySide6.QtLocation",
+            "PySide6.QtMultimediaWidgets",
+            "PySide6.QtNetworkAuth",
+            "PySide6.QtPdf",
+            "PySide6.QtPdfWidgets",
+            "PySide6.QtPositioning",
+            "PySide6.QtQuick",
+            "PySide6.QtQuick3D",
+            "PySide6.QtQuickControls2",
+            "PySide6.QtQuickWidgets",
+            "PySide6.QtRemoteObjects",
+            "PySide6.QtScxml",
+            "PySide6.QtSensors",
+            "PySide6.QtSpatialAudio",
+            "PySide6.QtSql",
+            "PySide6.QtStateMachine",
+            "PySide6.QtSvg",
+            "PySide6.QtSvgWidgets",
+            "PySide6.QtTest",
+            "PySide6.QtTextToSpeech",
+            "PySide6.QtUiTools",
+            "PySide6.QtWebChannel",
+            "PySide6.QtWebEngine",
+            "PySide6.QtWebEngineWidgets",
+            "PySide6.QtWebSockets",
+        ]
+    )
+
+elif system == "Windows":
+    icon = os.path.abspath("assets/windows/osw.ico")
+    excludes.append("multiprocessing.popen_spawn_posix")
+    # Add win32 imports if available
+    if importlib.util.find_spec("win32api"):
+        hiddenimports.extend(["win32api", "win32con", "win32gui"])
+        print("Added win32 imports")
+
+for package in collect_packages:
+    package_datas, package_binaries, package_hiddenimports = collect_all(package)
+    datas += package_datas
+    binaries += package_binaries
+    hiddenimports += package_hiddenimports
+
+a = Analysis(
+    [os.path.abspath("run_app.py")],
+    pathex=[],
+    binaries=binaries,
+    datas=datas,
+    hiddenimports=hiddenimports,
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=excludes,
+    noarchive=False,
+    optimize=0,
+)
+
+# Qt payload the app never loads: translations, QML, the SVG icon engine,
+# rarely used image formats, and the WebEngine/Quick/3D libraries
+# (Windows wheels omit the Qt/ path component, hence the optional group)
+_UNUSED_QT_DATA = re.compile(
+    r"^PySide6/(Qt/)?(translations/|qml/|plugins/iconengines/|plugins/imageformats/(lib)?q(jp2|tiff|webp))"
+)
+_UNUSED_QT_LIB = re.compile(r"(^|/)(lib)?Qt6?(WebEngine|Quick|3D)")
+
+
+def _is_unused_qt(entry):
+    dest = entry[0].replace("\\", "/")
+    return bool(_UNUSED_QT_DATA.match(dest) or _UNUSED_QT_LIB.search(dest))
+
+
+a.datas = [entry for entry in a.datas if not _is_unused_qt(entry)]
+a.binaries = [entry for entry in a.binaries if not _is_unused_qt(entry)]
+
+pyz = PYZ(a.pure)
+
+# Only strip on non-Windows platforms (may cause DLL issues on Windows)
+strip = system != "Windows"
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,  # onedir for all platforms to prevent DLL access violations
+    name=options.name,
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=strip,
+    upx=False,  # Disable UPX compression globally to prevent false positives
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=icon,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=strip,
+    upx=False,
+    upx_exclude=[],
+    name=options.name,
+)
+
+if system == "Darwin":
+    app = BUNDLE(
+        coll,
+        name=f"{options.name}.app",
+        icon=icon,
+        bundle_identifier="com.yutaishy.opensuperwhisper",
+    )
@@ -7,8 +7,10 @@
 import sys
 from typing import Any
 
-# Add paths
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Add paths (frozen builds already have the bundle on sys.path)
+_here = os.path.dirname(os.path.abspath(__file__))
+if not getattr(sys, "frozen", False) and _here not in sys.path:
+    sys.path.insert(0, _here)
 
 # Handle --version flag for CI/CD testing (source of truth from package)
 if len(sys.argv) > 1 and sys.argv[1] == "--version":
@@ -24,12 +26,13 @@
             print(f"OpenSuperWhisper v{pkg_version('opensuperwhisper')}")
         except Exception:
             try:
-                import tomllib  # Python 3.11+
+                import re
                 from pathlib import Path
 
+                # The version line is trivially greppable; no need for a full TOML parse
                 pyproject_text = Path("pyproject.toml").read_text(encoding="utf-8")
-                data = tomllib.loads(pyproject_text)
-                v = data.get("project", {}).get("version", "unknown")
+                match = re.search(r'^version\s*=\s*"([^"]+)"', pyproject_text, re.M)
+                v = match.group(1) if match else "unknown"
                 print(f"OpenSuperWhisper v{v}")
             except Exception:
                 print("OpenSuperWhisper vunknown")